@@ -0,0 +1,120 @@
+"""Continuous microphone capture into a preallocated ring buffer."""
+import threading
+import numpy as np
+import pyaudio
+from .config import Config
+
+_pyaudio_lock = threading.Lock()
+
+
+def create_pyaudio() -> pyaudio.PyAudio:
+    """Create a PyAudio instance (PortAudio initialisation is not thread-safe)."""
+    with _pyaudio_lock:
+        return pyaudio.PyAudio()
+
+
+class AudioCapture:
+    """
+    Capture microphone audio on PyAudio's callback thread.
+
+    Samples are copied once into a preallocated int16 ring buffer and never
+    reallocated. Readers address audio by absolute sample position (samples
+    since start()) and get NumPy views into the ring, so capture keeps
+    running while the LLM or TTS is busy and nothing is lost between turns.
+    """
+
+    def __init__(self, audio: pyaudio.PyAudio, rate=Config.SAMPLE_RATE, chunk=1024,
+                 buffer_seconds=Config.CAPTURE_BUFFER_SECONDS):
+        self.audio = audio
+        self.rate = rate
+        self.chunk = chunk
+
+        # Whole number of chunks so chunk-aligned reads never straddle the wrap point
+        n_chunks = -(-int(buffer_seconds * rate) // chunk)
+        self.capacity = n_chunks * chunk
+        self.buffer = np.zeros(self.capacity, dtype=np.int16)
+
+        self.stream = None
+        self.write_pos = 0
+        self.overflows = 0
+        self.cond = threading.Condition()
+
+    @property
+    def position(self) -> int:
+        """Absolute position of the newest captured sample."""
+        return self.write_pos
+
+    @property
+    def oldest_position(self) -> int:
+        """Absolute position of the oldest sample still held in the ring."""
+        return max(0, self.write_pos - self.capacity)
+
+    def start(self):
+        """Open the input stream in callback mode."""
+        if self.stream:
+            return
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=Config.CHANNELS,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+
+    def stop(self):
+        """Stop capture and wake any waiting readers."""
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        with self.cond:
+            self.cond.notify_all()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        start = self.write_pos % self.capacity
+        end = start + len(samples)
+        if end <= self.capacity:
+            self.buffer[start:end] = samples
+        else:
+            split = self.capacity - start
+            self.buffer[start:] = samples[:split]
+            self.buffer[:end - self.capacity] = samples[split:]
+
+        with self.cond:
+            self.write_pos += len(samples)
+            if status & pyaudio.paInputOverflow:
+                self.overflows += 1
+            self.cond.notify_all()
+        return (None, pyaudio.paContinue)
+
+    def read(self, pos: int, count: int, timeout=1.0):
+        """
+        Wait until samples [pos, pos + count) are captured and return them.
+        Returns None if they did not arrive within timeout or capture stopped.
+        """
+        with self.cond:
+            self.cond.wait_for(
+                lambda: self.write_pos >= pos + count or self.stream is None,
+                timeout=timeout
+            )
+            if self.write_pos < pos + count:
+                return None
+        return self.slice(pos, pos + count)
+
+    def slice(self, start: int, end: int) -> np.ndarray:
+        """
+        Return samples [start, end) as a view into the ring buffer.
+        Only a range that wraps around the end of the ring is copied.
+        """
+        if start < self.oldest_position:
+            raise ValueError("Requested audio has already been overwritten")
+        if end - start <= 0:
+            return self.buffer[:0]
+        first = start % self.capacity
+        last = first + (end - start)
+        if last <= self.capacity:
+            return self.buffer[first:last]
+        return np.concatenate((self.buffer[first:], self.buffer[:last - self.capacity]))
@@ -0,0 +1,143 @@
+"""Barge-in: stop the interviewer's playback as soon as the candidate starts talking."""
+import time
+import threading
+from .config import Config
+from .vad import VoiceActivityDetector
+
+
+class EchoRobustDetector:
+    """
+    Detect the candidate's speech while interviewer audio is playing.
+
+    This is a Geigel-style double-talk test on frame energies. A mic frame
+    counts as speech only when it passes the usual VAD tests (energy over
+    the noise floor, voiced zero-crossing rate) and is also louder than the
+    expected echo. The expected echo is the echo gain times the loudest
+    playback frame in the last BARGE_IN_ECHO_WINDOW_MS, and the frame has
+    to beat it by BARGE_IN_ECHO_MARGIN_DB. The echo gain starts at a
+    conservative 1.0 and is then learned slowly from frames that look like
+    pure echo. Frames well above the current estimate are ignored, so the
+    candidate's own voice never teaches the detector to ignore them.
+
+    The echo path does not change between replies, so one detector is kept
+    for the whole session and reset() before each reply.
+    """
+
+    def __init__(self, rate=Config.SAMPLE_RATE, noise_floor=None, frame_ms=16):
+        # 16 ms frames split the 1024-sample capture chunks evenly
+        self.vad = VoiceActivityDetector(rate, frame_ms=frame_ms)
+        self.frame_size = self.vad.frame_size
+        self.noise_floor = noise_floor or 1.0  # Learned by the STT engine's VAD while listening
+        self.margin = 10 ** (Config.BARGE_IN_ECHO_MARGIN_DB / 20)
+        self.onset_frames = max(1, int(Config.BARGE_IN_MIN_SPEECH_MS / frame_ms))
+        self.echo_gain = 1.0
+        self.gain_rate = 0.02
+        self.learn_limit = self.margin ** 0.5  # Only frames within half the margin count as echo
+        self.frames = 0
+        self.run = 0
+
+    def reset(self, noise_floor=None):
+        """Start a new reply: keep the learned echo gain, refresh the noise floor."""
+        if noise_floor:
+            self.noise_floor = noise_floor
+        self.frames = 0
+        self.run = 0
+
+    def process(self, samples, reference: float):
+        """
+        Feed a chunk of int16 mic samples and the playback level heard meanwhile.
+        Returns the frame index (since the first chunk) where speech began, or None.
+        """
+        rms, zcr = self.vad.frame_features(samples)
+        threshold = max(self.noise_floor * self.vad.snr_ratio, self.vad.min_rms)
+        echo = self.echo_gain * reference
+        for energy, crossings in zip(rms.tolist(), zcr.tolist()):
+            self.frames += 1
+            voiced = energy > threshold and crossings < self.vad.max_zcr
+            if voiced and energy > echo * self.margin:
+                self.run += 1
+                if self.run >= self.onset_frames:
+                    return self.frames - self.run
+                continue
+            self.run = 0
+            if reference > self.vad.min_rms and energy < echo * self.learn_limit:
+                # Most likely just the playback coming back through the mic
+                self.echo_gain += self.gain_rate * (energy / reference - self.echo_gain)
+                echo = self.echo_gain * reference
+        return None
+
+
+class BargeInMonitor:
+    """
+    Watch the microphone on a background thread while a reply plays.
+
+    Capture keeps running into the STT engine's ring buffer during
+    playback. When speech is detected, the player is stopped straight away
+    and speech_start holds the capture position where the candidate began.
+    The next listen_once() can start from there, so the interrupting words
+    are part of the next answer.
+    """
+
+    def __init__(self, stt, player, on_barge_in=None, detector=None):
+        """
+        Args:
+            stt: STT engine whose capture and learned noise floor are used
+            player: PCMStreamPlayer to stop; its reference_level() describes the playback
+            on_barge_in: optional callback run (on the monitor thread) after playback is stopped
+            detector: EchoRobustDetector shared across replies (a fresh one if None)
+        """
+        self.stt = stt
+        self.capture = stt.capture
+        self.player = player
+        self.on_barge_in = on_barge_in
+        if detector:
+            detector.reset(stt.vad.noise_floor)
+        else:
+            detector = EchoRobustDetector(stt.RATE, stt.vad.noise_floor)
+        self.detector = detector
+        self.pad = int(0.1 * stt.RATE)  # Keep the soft start of the first word
+        self.speech_start = None
+        self.start_pos = None
+        self.finished = threading.Event()
+        self.thread = None
+
+    @property
+    def detected(self) -> bool:
+        return self.speech_start is not None
+
+    def start(self):
+        if self.thread:
+            return
+        self.start_pos = self.capture.position
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        pos = self.start_pos
+        chunk = self.stt.CHUNK
+        # Playback written this long before a chunk ends can still be echoing in it
+        lookback = chunk / self.stt.RATE + Config.BARGE_IN_ECHO_WINDOW_MS / 1000
+        while not self.finished.is_set():
+            samples = self.capture.read(pos, chunk, timeout=0.1)
+            if samples is None:
+                continue
+            pos += len(samples)
+            reference = self.player.reference_level(time.monotonic() - lookback)
+            onset = self.detector.process(samples, reference)
+            if onset is None:
+                continue
+
+            self.player.stop()
+            onset_pos = self.start_pos + onset * self.detector.frame_size
+            self.speech_start = max(onset_pos - self.pad, self.capture.oldest_position)
+            # Speech onset to playback stop
+            self.stt.metrics.record("barge_in", (pos - onset_pos) / self.stt.RATE)
+            print("\n✋ Candidate started speaking, stopping playback")
+            if self.on_barge_in:
+                self.on_barge_in()
+            return
+
+    def stop(self):
+        self.finished.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
@@ -0,0 +1,180 @@
+"""Offline re-scoring of recorded interviews on a process pool."""
+import os
+import re
+import json
+import wave
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .config import Config
+
+MANIFEST_NAME = "batch_manifest.json"
+
+# Per-process state, set up once by _init_worker
+_worker = {}
+
+
+def read_wav(path: str, rate=Config.SAMPLE_RATE) -> np.ndarray:
+    """Read a 16-bit WAV file as mono int16 samples at rate."""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        channels, source_rate = wf.getnchannels(), wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if source_rate != rate:
+        # Linear resampling is plenty for speech recognition
+        positions = np.arange(0, len(samples), source_rate / rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples
+
+
+def read_questions(session_dir: str):
+    """Questions from a questions_*.txt saved by a live session ("Q1: ..." lines), if present."""
+    for name in sorted(os.listdir(session_dir)):
+        if name.startswith("questions") and name.endswith(".txt"):
+            with open(os.path.join(session_dir, name), 'r', encoding='utf-8') as f:
+                text = f.read()
+            return [q.strip() for q in re.split(r'^Q\d+:', text, flags=re.MULTILINE)[1:]]
+    return []
+
+
+def find_sessions(directory: str) -> dict:
+    """
+    Map session name -> answer WAV paths (in name order).
+    Each sub-folder holding WAVs is one session; WAVs directly inside
+    directory form a session named after it.
+    """
+    sessions = {}
+    for root, _, files in os.walk(directory):
+        wavs = sorted(f for f in files if f.lower().endswith(".wav"))
+        if wavs:
+            name = os.path.relpath(root, directory)
+            name = os.path.basename(os.path.abspath(directory)) if name == "." else name.replace(os.sep, "_")
+            sessions[name] = [os.path.join(root, f) for f in wavs]
+    return sessions
+
+
+def fingerprint(paths) -> str:
+    """Cheap identity of a session's audio, so edited recordings are re-scored."""
+    return ";".join(f"{os.path.basename(p)}:{os.path.getsize(p)}:{int(os.path.getmtime(p))}" for p in paths)
+
+
+def _init_worker(threads_per_worker: int):
+    """Load the STT model and Bedrock client once per worker process."""
+    if threads_per_worker and not os.environ.get("OMP_NUM_THREADS"):
+        # Split the cores between workers instead of every worker using all of them
+        os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+    from .stt_engine import create_stt_engine
+    from .bedrock_client import ResilientBedrockClient
+    from .model_router import ModelRouter
+    _worker["stt"] = create_stt_engine(capture=False)
+    _worker["bedrock"] = ResilientBedrockClient()
+    _worker["router"] = ModelRouter()
+
+
+def _score_session(name: str, paths, notes_text: str) -> dict:
+    """Transcribe one session's answers and write its report (runs in a worker)."""
+    from .bedrock_handler import BedrockHandler
+    stt = _worker["stt"]
+    brain = BedrockHandler(client=_worker["bedrock"], router=_worker["router"])
+    brain.initialize_interview(notes_text)
+    questions = read_questions(os.path.dirname(paths[0]))
+
+    start = time.perf_counter()
+    for i, path in enumerate(paths):
+        # Without a questions file each recording still needs its own turn to be scored
+        question = questions[i] if i < len(questions) else f"Question {i + 1}"
+        brain.conversation_history.append({"role": "assistant", "content": [{"text": question}]})
+        answer = stt.transcribe(read_wav(path)) or "[no speech detected]"
+        brain.record_answer(answer)  # Scored in the background while the next file is transcribed
+    stt_seconds = time.perf_counter() - start
+
+    if brain.evaluator:
+        # Offline there is no reason to cap the wait: every answer must be scored
+        missing = [i + 1 for i, turn in enumerate(brain.evaluator.results(timeout=None)) if not turn[2]]
+        if missing:
+            # Fail the session so a rerun scores it again instead of keeping a partial report
+            raise RuntimeError(f"answers {missing} could not be evaluated")
+
+    report_path = brain.generate_report(session_id=name)
+    return {"report": report_path, "answers": len(paths), "stt_seconds": round(stt_seconds, 2)}
+
+
+class BatchRunner:
+    """
+    Re-score a directory of recorded interviews.
+
+    Sessions are spread over a ProcessPoolExecutor whose workers each load
+    the STT model once. Progress is printed as sessions finish and recorded
+    in a manifest next to the recordings, so a rerun after a crash only
+    processes sessions that are missing, failed or whose audio changed.
+    """
+
+    def __init__(self, directory: str, workers=Config.BATCH_WORKERS):
+        self.directory = directory
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Ignoring unreadable manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _save_manifest(self):
+        # Write then rename so a crash never leaves a half-written manifest
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def pending(self, sessions: dict) -> dict:
+        """Sessions without a finished entry for their current audio."""
+        return {
+            name: paths for name, paths in sessions.items()
+            if self.manifest.get(name, {}).get("status") != "done"
+            or self.manifest[name].get("fingerprint") != fingerprint(paths)
+        }
+
+    def run(self) -> dict:
+        sessions = find_sessions(self.directory)
+        todo = self.pending(sessions)
+        print(f"[OK] {len(sessions)} sessions found, {len(sessions) - len(todo)} already scored, {len(todo)} to go")
+        if not todo:
+            return self.manifest
+
+        with open(Config.NOTES_PATH, 'r', encoding='utf-8') as f:
+            notes_text = f.read()
+
+        workers = min(self.workers, len(todo))
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        print(f"[OK] Scoring on {workers} worker processes ({threads_per_worker} threads each)")
+
+        start = time.perf_counter()
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(threads_per_worker,)) as pool:
+            futures = {pool.submit(_score_session, name, paths, notes_text): name for name, paths in todo.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                done += 1
+                entry = {"fingerprint": fingerprint(todo[name])}
+                try:
+                    entry.update(status="done", **future.result())
+                    print(f"[{done}/{len(todo)}] ✅ {name}: {entry['answers']} answers -> {entry['report']}")
+                except Exception as e:
+                    entry.update(status="failed", error=str(e))
+                    print(f"[{done}/{len(todo)}] [ERROR] {name}: {e}")
+                self.manifest[name] = entry
+                self._save_manifest()
+
+        failed = sum(1 for name in todo if self.manifest[name]["status"] != "done")
+        print(f"[OK] Batch finished in {time.perf_counter() - start:.1f}s ({failed} failed)")
+        return self.manifest
@@ -0,0 +1,201 @@
+"""Bedrock runtime client with latency-derived deadlines, jittered retries and hedging."""
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import boto3
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError, BotoCoreError
+from .config import Config
+
+# Error codes worth another attempt; anything else (validation, access) fails fast
+RETRYABLE_CODES = {
+    "ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException",
+    "InternalServerException", "ModelNotReadyException", "ModelTimeoutException",
+}
+
+
+class BedrockUnavailable(Exception):
+    """Raised when Bedrock could not answer within the retry budget."""
+
+
+class DeadlineExceeded(Exception):
+    """One attempt took longer than its deadline."""
+
+
+def create_bedrock_client():
+    """boto3 bedrock-runtime client with explicit timeouts and a sized connection pool."""
+    return boto3.client('bedrock-runtime', region_name='us-east-1', config=BotoConfig(
+        connect_timeout=Config.BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=Config.BEDROCK_READ_TIMEOUT,
+        max_pool_connections=Config.BEDROCK_MAX_POOL_CONNECTIONS,
+        # Client-side rate limiting only; retries are done by ResilientBedrockClient
+        retries={"mode": "adaptive", "max_attempts": 1},
+    ))
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, DeadlineExceeded):
+        return True
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_CODES
+    # Connection resets, read timeouts, endpoint errors
+    return isinstance(error, BotoCoreError)
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies with percentile lookup."""
+
+    def __init__(self, window=200, min_samples=5):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q: float):
+        """Latency at percentile q, or None until enough calls have been seen."""
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class ResilientBedrockClient:
+    """
+    Drop-in wrapper for converse/converse_stream.
+
+    - Each attempt gets a deadline of BEDROCK_DEADLINE_FACTOR x the observed
+      p99 latency (clamped to [BEDROCK_MIN_DEADLINE, BEDROCK_READ_TIMEOUT]).
+    - Retryable failures back off with full jitter, within BEDROCK_TOTAL_TIMEOUT.
+    - With BEDROCK_HEDGING, a second identical request is sent once an
+      attempt runs past the observed p95; whichever answers first wins.
+    Raises BedrockUnavailable when every attempt failed.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or create_bedrock_client()
+        # (operation, modelId, call) -> LatencyTracker: a fast model's summaries say
+        # nothing about how long a large model's report should take
+        self.latency = {}
+        self.executor = ThreadPoolExecutor(max_workers=Config.BEDROCK_MAX_POOL_CONNECTIONS,
+                                           thread_name_prefix="bedrock")
+        self.stats = {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "failures": 0}
+        self.lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def converse(self, call=None, **kwargs):
+        """call names the kind of request (e.g. "report") so its latency is tracked separately."""
+        return self._call("converse", kwargs, call)
+
+    def converse_stream(self, call=None, **kwargs):
+        # Only opening the stream is retried; once text is flowing it is the caller's
+        return self._call("converse_stream", kwargs, call)
+
+    def _tracker(self, operation: str, kwargs: dict, call=None) -> LatencyTracker:
+        key = (operation, kwargs.get("modelId"), call)
+        with self.lock:
+            if key not in self.latency:
+                self.latency[key] = LatencyTracker()
+            return self.latency[key]
+
+    def _deadline(self, tracker: LatencyTracker) -> float:
+        p99 = tracker.percentile(99)
+        if p99 is None:
+            return Config.BEDROCK_READ_TIMEOUT
+        return min(max(p99 * Config.BEDROCK_DEADLINE_FACTOR, Config.BEDROCK_MIN_DEADLINE),
+                   Config.BEDROCK_READ_TIMEOUT)
+
+    def _call(self, operation: str, kwargs: dict, call=None):
+        self._count("calls")
+        budget_end = time.monotonic() + Config.BEDROCK_TOTAL_TIMEOUT
+        tracker = self._tracker(operation, kwargs, call)
+        last_error = None
+        for attempt in range(Config.BEDROCK_MAX_ATTEMPTS):
+            remaining = budget_end - time.monotonic()
+            if remaining <= 0:
+                break
+            if attempt:
+                self._count("retries")
+            try:
+                return self._attempt(operation, kwargs, tracker, min(self._deadline(tracker), remaining))
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e):
+                    break
+                # Full jitter: spread retries out so clients don't retry in lockstep
+                backoff = random.uniform(0, min(Config.BEDROCK_BACKOFF_CAP, Config.BEDROCK_BACKOFF_BASE * 2 ** attempt))
+                time.sleep(min(backoff, max(0.0, budget_end - time.monotonic())))
+        self._count("failures")
+        raise BedrockUnavailable(f"Bedrock {operation} failed: {last_error}") from last_error
+
+    def _attempt(self, operation: str, kwargs: dict, tracker: LatencyTracker, deadline: float):
+        call = getattr(self.client, operation)
+        start = time.monotonic()
+        primary = self.executor.submit(call, **kwargs)
+        futures = [primary]
+
+        hedge_after = tracker.percentile(95) if Config.BEDROCK_HEDGING else None
+        if hedge_after is not None and hedge_after < deadline:
+            done, _ = wait(futures, timeout=hedge_after)
+            if not done:
+                self._count("hedges")
+                futures.append(self.executor.submit(call, **kwargs))
+
+        error = None
+        pending = set(futures)
+        while pending:
+            remaining = deadline - (time.monotonic() - start)
+            done, pending = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception():
+                    error = future.exception()
+                    continue
+                tracker.add(time.monotonic() - start)
+                if future is not primary:
+                    self._count("hedge_wins")
+                # The other request may still answer: release it when it does
+                for other in pending:
+                    other.add_done_callback(self._discard)
+                for other in done - {future}:
+                    self._discard(other)
+                return future.result()
+
+        for future in pending:
+            future.add_done_callback(self._discard)
+        if pending or error is None:
+            raise DeadlineExceeded(f"{operation} exceeded {deadline:.1f}s")
+        raise error
+
+    @staticmethod
+    def _discard(future):
+        """Close a losing or late streaming response so its connection is released."""
+        if future.cancelled() or future.exception():
+            return
+        result = future.result()
+        stream = result.get("stream") if isinstance(result, dict) else None
+        if stream is not None and hasattr(stream, "close"):
+            stream.close()
+
+    def summary(self) -> str:
+        with self.lock:
+            stats = dict(self.stats)
+            trackers = dict(self.latency)
+        p95s = []
+        for (operation, model_id, call), tracker in sorted(trackers.items(), key=lambda item: str(item[0])):
+            p95 = tracker.percentile(95)
+            if p95 is not None:
+                p95s.append(f"{call or operation} on {model_id} p95 {p95:.2f}s")
+        p95_text = f"; {', '.join(p95s)}" if p95s else ""
+        return (f"{stats['calls']} calls, {stats['retries']} retries, "
+                f"{stats['hedges']} hedged ({stats['hedge_wins']} won), "
+                f"{stats['failures']} failed{p95_text}")
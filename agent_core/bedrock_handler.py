@@ -1,17 +1,74 @@
 """AWS Bedrock handler using the Converse API."""
-import boto3
 import json
+import re
+import time
+import threading
 from .config import Config
+from .context_manager import ConversationContext
+from .notes_index import NotesIndex
+from .metrics import NULL_METRICS
+from .turn_evaluator import TurnEvaluator
+from .speculation import SpeculativeReply
+from .bedrock_client import ResilientBedrockClient, BedrockUnavailable
+from .model_router import ModelRouter
 from datetime import datetime
 import os
 
+# Sentence boundary: terminal punctuation (optionally followed by a closing
+# quote/bracket) and then whitespace.
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+
+# Spoken when Bedrock is unavailable; never stored in the conversation history
+FALLBACK_REPLY = "Sorry, I am having trouble connecting right now. Could you repeat your answer?"
+
+# Appended to a reply the candidate cut short, after the part they heard
+INTERRUPTED_MARK = "[interrupted by the candidate]"
+
+
+def iter_sentences(deltas, min_chars=12):
+    """
+    Group streamed text deltas into complete sentences.
+    Fragments shorter than min_chars are held back and merged with the next
+    sentence so TTS is not asked to speak "Ok." on its own.
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        start = 0
+        for match in SENTENCE_END.finditer(buffer):
+            if match.end() - start < min_chars:
+                continue
+            yield buffer[start:match.end()].strip()
+            start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
 class BedrockHandler:
-    def __init__(self):
-        self.client = boto3.client('bedrock-runtime', region_name='us-east-1')
-        self.model_id = "us.meta.llama3-1-70b-instruct-v1:0" 
+    def __init__(self, client=None, router=None):
+        # boto3 clients are thread-safe, so sessions can share one (and its latency stats)
+        self.client = client if isinstance(client, ResilientBedrockClient) else ResilientBedrockClient(client)
+        self.router = router or ModelRouter()  # Picks the model for each call
         self.conversation_history = []
         self.system_prompt = ""
+        self.prompt_template = ""
         self.notes_content = ""
+        self.notes_index = None
+        self.context = ConversationContext(self._summarize)
+        self.metrics = NULL_METRICS  # Replaced by a MetricsRecorder when metrics are enabled
+        self.evaluator = TurnEvaluator(self._evaluate_turn, self._journal_evaluation) if Config.INCREMENTAL_EVALUATION else None
+        self.journal = None  # SessionJournal recording each turn, if set
+        self.pending_answer = False  # Restored history ends with an unanswered reply
+        self.history_lock = threading.Lock()
+        self.interrupted_reply = None  # Heard part of a reply interrupted before it reached history
+        
+        # Speculative replies started on a provisional transcript
+        self.speculation = None
+        self.speculation_lock = threading.Lock()
+        self.speculation_stats_lock = threading.Lock()  # Stats are also updated from speculation threads
+        self.speculation_stats = {"started": 0, "hits": 0, "misses": 0,
+                                  "wasted_input_tokens": 0, "wasted_output_tokens": 0}
     
     def _load_prompt_template(self, filename: str) -> str:
         """Load a prompt template from the prompts directory."""
@@ -23,44 +80,126 @@ class BedrockHandler:
             print(f"[ERROR] Prompt file not found: {prompt_path}")
             return ""
         
-    def initialize_interview(self, notes_text: str):
-        """Initialize interview with notes content and prompt template."""
+    def initialize_interview(self, notes_text: str, notes_index: NotesIndex = None):
+        """
+        Initialize interview with notes content and prompt template.
+        An existing notes_index can be passed in to share one index between sessions.
+        """
         self.notes_content = notes_text
         
         # Load the interview system prompt template
-        prompt_template = self._load_prompt_template("interview_system_prompt.txt")
+        self.prompt_template = self._load_prompt_template("interview_system_prompt.txt")
         
         # Replace {notes_content} placeholder with actual notes
-        self.system_prompt = prompt_template.replace("{notes_content}", notes_text)
+        self.system_prompt = self.prompt_template.replace("{notes_content}", notes_text)
         
-        print("[OK] Interview initialized (Llama 3.1 70B via Converse API)")
+        print(f"[OK] Interview initialized via Converse API ({self.router.describe()})")
         print(f"[OK] Loaded study material from Notes.txt")
+        
+        if Config.NOTES_RETRIEVAL:
+            # Index the notes so each turn only carries the relevant passages
+            self.notes_index = notes_index or NotesIndex(notes_text)
+            print(f"[OK] Notes index ready: {len(self.notes_index)} passages ({self.notes_index.reused} reused)")
         print(f"[OK] Interview focus: {Config.ROLE}")
     
-    def _invoke_model(self, messages, is_report=False):
-        """Invoke using Bedrock Converse API (Auto-formats Llama 3 tokens)."""
-        
+    def _system_prompt_for(self, query: str) -> str:
+        """System prompt with the study material narrowed to passages relevant to query."""
+        if not self.notes_index:
+            return self.system_prompt
+        passages = self.notes_index.search(query)
+        return self.prompt_template.replace("{notes_content}", "\n\n---\n\n".join(passages))
+
+    def _turn_query(self, history=None) -> str:
+        """Retrieval query for the next turn: the last question and the candidate's answer."""
+        history = self.conversation_history if history is None else history
+        return " ".join(entry['content'][0]['text'] for entry in history[-2:])
+
+    def _converse_args(self, messages, model_id, is_report=False, system_text=None):
+        """Build the keyword arguments shared by converse and converse_stream."""
         # Prepare System Prompt
         system_prompts = []
         if not is_report:
-            system_prompts = [{"text": self.system_prompt}]
-            
+            system_prompts = [{"text": system_text or self.system_prompt}]
+
+        return {
+            "modelId": model_id,
+            "messages": messages,
+            "system": system_prompts,
+            "inferenceConfig": {
+                "maxTokens": 1024,
+                "temperature": 0.7,
+                "topP": 0.9
+            }
+        }
+
+    def _invoke_model(self, messages, is_report=False, system_text=None, call="turn"):
+        """
+        Invoke using Bedrock Converse API (Auto-formats Llama 3 tokens).
+        call is the router's call type. Returns None if Bedrock could not answer.
+        """
+        model_id, reason = self.router.choose(call)
+        start = time.perf_counter()
         # Call Bedrock Converse
         try:
-            response = self.client.converse(
-                modelId=self.model_id,
-                messages=messages,
-                system=system_prompts,
-                inferenceConfig={
-                    "maxTokens": 1024,
-                    "temperature": 0.7,
-                    "topP": 0.9
-                }
-            )
+            with self.metrics.span("llm_offline" if is_report else "llm_total", model=model_id, call=call, route=reason):
+                response = self.client.converse(call=call, **self._converse_args(messages, model_id, is_report, system_text))
             return response["output"]["message"]["content"][0]["text"]
         except Exception as e:
             print(f"Bedrock API Error: {e}")
-            return "I am having trouble connecting to the brain."
+            return None
+        finally:
+            self.router.record(model_id, call, time.perf_counter() - start, reason)
+
+    def _stream_model(self, messages, is_report=False, system_text=None, call="turn"):
+        """
+        Invoke using Bedrock ConverseStream API, yielding text deltas as they arrive.
+        call is the router's call type. Raises BedrockUnavailable if the request fails.
+        """
+        model_id, reason = self.router.choose(call)
+        fields = {"model": model_id, "call": call, "route": reason}
+        start = time.perf_counter()
+        first_token = None
+        response = None
+        try:
+            response = self.client.converse_stream(call=call, **self._converse_args(messages, model_id, is_report, system_text))
+            for event in response["stream"]:
+                if "contentBlockDelta" in event:
+                    text = event["contentBlockDelta"]["delta"].get("text", "")
+                    if text:
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+                            self.metrics.record("llm_ttft", first_token, **fields)
+                            self.router.record(model_id, call, first_token, reason)
+                        yield text
+            self.metrics.record("llm_total", time.perf_counter() - start, **fields)
+        except Exception as e:
+            if first_token is None:
+                # A failed call counts against the model with the time it took
+                self.router.record(model_id, call, time.perf_counter() - start, reason)
+            print(f"Bedrock API Error: {e}")
+            raise BedrockUnavailable(str(e)) from e
+        finally:
+            # Release the HTTP connection when the caller stops reading early
+            if response and hasattr(response["stream"], "close"):
+                response["stream"].close()
+
+    def _stream_reply(self, messages, system_text=None, call="turn"):
+        """
+        Yield the reply sentence by sentence and append the full text to
+        history once the stream is finished (or abandoned by the caller).
+        """
+        parts = []
+        try:
+            for sentence in iter_sentences(self._stream_model(messages, system_text=system_text, call=call)):
+                parts.append(sentence)
+                yield sentence
+        except BedrockUnavailable:
+            if not parts:
+                yield FALLBACK_REPLY
+        finally:
+            # A reply that never started is not recorded; the next answer joins the pending one
+            if parts:
+                self._add_message("assistant", " ".join(parts))
 
     def get_first_question(self) -> str:
         initial_msg = {
@@ -68,37 +207,249 @@ class BedrockHandler:
             "content": [{"text": "Start the interview. Greet the candidate briefly and ask your first question based on the study material."}]
         }
         
-        response_text = self._invoke_model([initial_msg])
+        response_text = self._invoke_model([initial_msg], system_text=self._system_prompt_for(""))
         
         # Save BOTH the trigger and the response to history
-        self.conversation_history.append(initial_msg)
-        self.conversation_history.append({"role": "assistant", "content": [{"text": response_text}]})
+        self._add_message("user", initial_msg["content"][0]["text"])
+        if response_text is None:
+            return FALLBACK_REPLY
+        self._add_message("assistant", response_text)
         
         return response_text
     
+    def _append_history(self, role: str, text: str):
+        last = self.conversation_history[-1] if self.conversation_history else None
+        if last and last['role'] == role == 'user':
+            # The previous answer got no reply (Bedrock failed): Converse needs
+            # alternating roles, so both answers become one user message
+            last['content'][0]['text'] += f"\n\n{text}"
+        else:
+            self.conversation_history.append({"role": role, "content": [{"text": text}]})
+
+    def _add_message(self, role: str, text: str):
+        """Append to history and to the session journal."""
+        with self.history_lock:
+            if role == "assistant" and self.interrupted_reply:
+                text, self.interrupted_reply = self.interrupted_reply, None
+            self._append_history(role, text)
+            if self.journal:
+                self.journal.message(role, text)
+
+    def mark_interrupted(self, heard_text: str):
+        """
+        Replace the last reply with the part the candidate heard before barging in.
+        The reply may still be on its way into history (its stream is closed on
+        another thread), in which case it is replaced when it gets there.
+        """
+        text = f"{heard_text} {INTERRUPTED_MARK}".strip()
+        with self.history_lock:
+            last = self.conversation_history[-1] if self.conversation_history else None
+            if last and last['role'] == 'assistant':
+                last['content'][0]['text'] = text
+                if self.journal:
+                    self.journal.append({"type": "interrupted", "text": text})
+            else:
+                self.interrupted_reply = text
+
+    def _journal_evaluation(self, index: int, result: dict):
+        if self.journal and result:
+            self.journal.append({"type": "evaluation", "index": index, "result": result})
+
+    def restore(self, records) -> bool:
+        """
+        Rebuild history and per-turn scores from journal records.
+        Returns True if the last message is an answer still waiting for a reply.
+        """
+        scores = {}
+        answers = {}
+        for record in records:
+            if record.get("type") == "message":
+                self._append_history(record["role"], record["text"])
+            elif record.get("type") == "interrupted" and self.conversation_history:
+                self.conversation_history[-1]['content'][0]['text'] = record["text"]
+            elif record.get("type") == "answer":
+                answers[record["index"]] = (record["question"], record["answer"])
+            elif record.get("type") == "evaluation":
+                scores[record["index"]] = record["result"]
+
+        if self.evaluator:
+            # Answers merged in history (no reply in between) were still scored separately
+            for index in sorted(answers):
+                question, answer = answers[index]
+                self.evaluator.restore(question, answer, scores.get(index))
+        print(f"[OK] Restored {len(self.conversation_history)} messages ({len(scores)} scored answers)")
+        return bool(self.conversation_history) and self.conversation_history[-1]['role'] == 'user'
+
+    def stream_pending_response(self):
+        """Reply to an answer already in history (e.g. restored from a journal)."""
+        system_text, messages = self.context.build(self.conversation_history, self._system_prompt_for(self._turn_query()))
+        call = self.router.reply_call(self.conversation_history[-1]['content'][0]['text'])
+        yield from self._stream_reply(messages, system_text, call)
+
+    def record_answer(self, user_answer: str):
+        """Add the candidate's answer to history and start scoring it in the background."""
+        question = next((entry['content'][0]['text'] for entry in reversed(self.conversation_history)
+                         if entry['role'] == 'assistant'), None)
+        self.interrupted_reply = None  # Left over from a reply that never reached history
+        self._add_message("user", user_answer)
+        if self.evaluator and question:
+            index = self.evaluator.submit(question, user_answer)
+            if self.journal:
+                self.journal.append({"type": "answer", "index": index, "question": question, "answer": user_answer})
+
+    def speculate(self, provisional_answer: str):
+        """
+        Start generating the reply to a provisional transcript in the background.
+        A speculation for a different transcript is cancelled first.
+        """
+        with self.speculation_lock:
+            if self.speculation and self.speculation.matches(provisional_answer):
+                return
+            self._discard_speculation()
+            with self.history_lock:
+                history = list(self.conversation_history)
+            if history and history[-1]['role'] == 'user':
+                # The last reply has not reached history yet: merge as _append_history() would
+                provisional_text = f"{history.pop()['content'][0]['text']}\n\n{provisional_answer}"
+            else:
+                provisional_text = provisional_answer
+            history.append({"role": "user", "content": [{"text": provisional_text}]})
+            system_text, messages = self.context.build(history, self._system_prompt_for(self._turn_query(history)))
+            input_tokens = self.context.estimate_tokens(system_text) + sum(
+                self.context.estimate_tokens(message['content'][0]['text']) for message in messages)
+            call = self.router.reply_call(provisional_answer)
+            self.speculation = SpeculativeReply(
+                provisional_answer,
+                lambda: iter_sentences(self._stream_model(messages, system_text=system_text, call=call)),
+                input_tokens
+            )
+            with self.speculation_stats_lock:
+                self.speculation_stats["started"] += 1
+
+    def cancel_speculation(self):
+        """Drop the speculative reply (e.g. the candidate started speaking again)."""
+        with self.speculation_lock:
+            self._discard_speculation()
+
+    def _discard_speculation(self):
+        if not self.speculation:
+            return
+        self.speculation.cancel()
+        with self.speculation_stats_lock:
+            self.speculation_stats["misses"] += 1
+            self.speculation_stats["wasted_input_tokens"] += self.speculation.input_tokens
+        # The stream keeps producing text until it notices the cancel: count it all
+        self.speculation.when_finished(self._count_wasted_output)
+        self.speculation = None
+
+    def _count_wasted_output(self, speculation):
+        with self.speculation_stats_lock:
+            self.speculation_stats["wasted_output_tokens"] += self.context.estimate_tokens(speculation.text)
+
+    def _take_speculation(self, user_answer: str):
+        """The speculative reply if it was made for this exact answer, otherwise None."""
+        with self.speculation_lock:
+            speculation = self.speculation
+            if speculation and speculation.matches(user_answer):
+                self.speculation = None
+                with self.speculation_stats_lock:
+                    self.speculation_stats["hits"] += 1
+                return speculation
+            self._discard_speculation()
+            return None
+
+    def speculation_summary(self) -> str:
+        with self.speculation_stats_lock:
+            stats = dict(self.speculation_stats)
+        decided = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / decided if decided else 0.0
+        return (f"{stats['hits']}/{decided} hits ({hit_rate:.0%}), wasted ~{stats['wasted_input_tokens']} input "
+                f"+ ~{stats['wasted_output_tokens']} output tokens")
+
+    def _adopt_speculation(self, speculation):
+        """Yield a speculative reply's sentences and record it in history."""
+        parts = []
+        try:
+            for sentence in speculation.sentences():
+                parts.append(sentence)
+                yield sentence
+            if not parts and speculation.error:
+                yield FALLBACK_REPLY
+        finally:
+            speculation.cancel()  # No-op if it already finished
+            if parts:
+                self._add_message("assistant", " ".join(parts))
+
     def get_response(self, user_answer: str) -> str:
+        speculation = self._take_speculation(user_answer)
+        
         # Add User Answer
-        self.conversation_history.append({"role": "user", "content": [{"text": user_answer}]})
+        self.record_answer(user_answer)
         
-        # Invoke
-        response_text = self._invoke_model(self.conversation_history)
+        if speculation:
+            return " ".join(self._adopt_speculation(speculation))
+        
+        # Invoke with recent turns verbatim and older ones summarized
+        system_text, messages = self.context.build(self.conversation_history, self._system_prompt_for(self._turn_query()))
+        response_text = self._invoke_model(messages, system_text=system_text, call=self.router.reply_call(user_answer))
+        if response_text is None:
+            return FALLBACK_REPLY
         
         # Add AI Response
-        self.conversation_history.append({"role": "assistant", "content": [{"text": response_text}]})
+        self._add_message("assistant", response_text)
         return response_text
+
+    def stream_first_question(self):
+        """Streaming variant of get_first_question: yields sentences as they are generated."""
+        initial_msg = {
+            "role": "user",
+            "content": [{"text": "Start the interview. Greet the candidate briefly and ask your first question based on the study material."}]
+        }
+        self._add_message("user", initial_msg["content"][0]["text"])
+        yield from self._stream_reply([initial_msg], self._system_prompt_for(""))
+
+    def stream_response(self, user_answer: str):
+        """Streaming variant of get_response: yields sentences as they are generated."""
+        speculation = self._take_speculation(user_answer)
+        self.record_answer(user_answer)
+        if speculation:
+            yield from self._adopt_speculation(speculation)
+            return
+        system_text, messages = self.context.build(self.conversation_history, self._system_prompt_for(self._turn_query()))
+        yield from self._stream_reply(messages, system_text, self.router.reply_call(user_answer))
+
+    def _summarize(self, previous_summary: str, messages) -> str:
+        """Fold older turns into the running summary (None on failure so the old one is kept)."""
+        prompt_template = self._load_prompt_template("context_summary_prompt.txt")
+        lines = [f"{entry['role'].upper()}: {entry['content'][0]['text']}" for entry in messages]
+        prompt = prompt_template.replace("{summary}", previous_summary or "(none yet)")
+        prompt = prompt.replace("{transcript}", "\n".join(lines))
+        
+        return self._invoke_model([{"role": "user", "content": [{"text": prompt}]}], is_report=True, call="summary")
+    
+    def _evaluate_turn(self, question: str, answer: str) -> str:
+        """Score one answer with the compact per-turn prompt (runs on the evaluator's threads)."""
+        prompt = self._load_prompt_template("turn_evaluation_prompt.txt")
+        prompt = prompt.replace("{role}", Config.ROLE).replace("{question}", question).replace("{answer}", answer)
+        return self._invoke_model([{"role": "user", "content": [{"text": prompt}]}], is_report=True, call="evaluation")
     
-    def generate_report(self) -> str:
+    def generate_report(self, session_id: str = None) -> str:
         print("\n📊 Generating report...")
         transcript = self._format_transcript()
         
-        # Load report evaluation prompt template
-        prompt_template = self._load_prompt_template("report_evaluation_prompt.txt")
-        evaluation_prompt = prompt_template.replace("{transcript}", transcript)
-        
-        # New message context for the report
-        messages = [{"role": "user", "content": [{"text": evaluation_prompt}]}]
-        
-        evaluation = self._invoke_model(messages, is_report=True)
+        if self.evaluator and self.evaluator.turns:
+            # Answers were scored during the interview: just merge the results
+            evaluation = self.evaluator.merge()
+            self.evaluator.shutdown()
+        else:
+            # Load report evaluation prompt template
+            prompt_template = self._load_prompt_template("report_evaluation_prompt.txt")
+            evaluation_prompt = prompt_template.replace("{transcript}", transcript)
+            
+            # New message context for the report
+            messages = [{"role": "user", "content": [{"text": evaluation_prompt}]}]
+            
+            evaluation = self._invoke_model(messages, is_report=True, call="report") or "Evaluation unavailable: Bedrock could not be reached."
         
         # Create report content
         report_content = f"""INTERVIEW EVALUATION REPORT
@@ -121,8 +472,17 @@ EVALUATION
 {'=' * 60}
 End of Report
 """
+        if self.metrics.enabled:
+            report_content = report_content.replace("End of Report", f"""LATENCY (per stage)
+{'=' * 60}
+
+{self.metrics.format_summary()}
+
+{'=' * 60}
+End of Report""")
         
-        filename = f"interview_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        suffix = f"_{session_id}" if session_id else ""
+        filename = f"interview_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}.txt"
         # Save to reports directory
         reports_dir = os.path.join(os.getcwd(), "reports")
         if not os.path.exists(reports_dir):
@@ -136,7 +496,7 @@ End of Report
         print(f"[OK] Report saved to: {filename}")
         
         # Also extract and save questions to answer folder
-        self._save_questions_to_file()
+        self._save_questions_to_file(suffix)
         
         return filepath
     
@@ -149,7 +509,7 @@ End of Report
             lines.append(f"{role}: {text}")
         return "\n".join(lines)
     
-    def _save_questions_to_file(self):
+    def _save_questions_to_file(self, suffix=""):
         """Extract interviewer questions and save to answer folder."""
         questions = []
         question_num = 1
@@ -165,7 +525,7 @@ End of Report
         if not os.path.exists(answer_dir):
             os.makedirs(answer_dir)
         
-        filename = f"questions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        filename = f"questions_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}.txt"
         filepath = os.path.join(answer_dir, filename)
         
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -15,9 +15,116 @@ class Config:
     MAX_QUESTIONS = int(os.getenv("MAX_QUESTIONS", "5"))
     ROLE = os.getenv("ROLE", "Software Engineer")
     
+    # Response Settings
+    # Stream Bedrock replies and speak them sentence-by-sentence as they arrive
+    STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() == "true"
+    
+    # Start the reply on the transcript at the first pause, before end of turn is confirmed
+    SPECULATIVE_REPLIES = os.getenv("SPECULATIVE_REPLIES", "false").lower() == "true"
+    
+    # Bedrock Resilience
+    BEDROCK_CONNECT_TIMEOUT = float(os.getenv("BEDROCK_CONNECT_TIMEOUT", "3"))
+    BEDROCK_READ_TIMEOUT = float(os.getenv("BEDROCK_READ_TIMEOUT", "30"))  # Also the longest per-attempt deadline
+    BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "16"))
+    BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", "3"))
+    BEDROCK_TOTAL_TIMEOUT = float(os.getenv("BEDROCK_TOTAL_TIMEOUT", "45"))  # Budget for all attempts of one call
+    BEDROCK_DEADLINE_FACTOR = float(os.getenv("BEDROCK_DEADLINE_FACTOR", "3"))  # Attempt deadline = factor x p99
+    BEDROCK_MIN_DEADLINE = float(os.getenv("BEDROCK_MIN_DEADLINE", "2"))
+    BEDROCK_BACKOFF_BASE = float(os.getenv("BEDROCK_BACKOFF_BASE", "0.25"))
+    BEDROCK_BACKOFF_CAP = float(os.getenv("BEDROCK_BACKOFF_CAP", "4"))
+    BEDROCK_HEDGING = os.getenv("BEDROCK_HEDGING", "false").lower() == "true"  # Duplicate requests slower than p95
+    
+    # Model Routing
+    # Small model for interactive turns, large model for hard follow-ups, scoring and the report
+    MODEL_ROUTING = os.getenv("MODEL_ROUTING", "true").lower() == "true"  # false: every call uses MODEL_LARGE
+    MODEL_FAST = os.getenv("MODEL_FAST", "us.meta.llama3-1-8b-instruct-v1:0")
+    MODEL_LARGE = os.getenv("MODEL_LARGE", "us.meta.llama3-1-70b-instruct-v1:0")
+    MODEL_HARD_ANSWER_WORDS = int(os.getenv("MODEL_HARD_ANSWER_WORDS", "60"))  # Longer answers get the large model
+    MODEL_TURN_BUDGET = float(os.getenv("MODEL_TURN_BUDGET", "1.5"))  # Seconds until reply text starts (recent p90); 0 = none
+    MODEL_BACKGROUND_BUDGET = float(os.getenv("MODEL_BACKGROUND_BUDGET", "30"))  # Seconds per background call; 0 = none
+    MODEL_LATENCY_WINDOW = int(os.getenv("MODEL_LATENCY_WINDOW", "20"))  # Recent calls per model considered
+    MODEL_PROBE_EVERY = int(os.getenv("MODEL_PROBE_EVERY", "5"))  # While over budget, every Nth call retries the model; 0 = never
+    
+    # Barge-in
+    BARGE_IN = os.getenv("BARGE_IN", "true").lower() == "true"  # Stop playback when the candidate starts talking
+    BARGE_IN_MIN_SPEECH_MS = int(os.getenv("BARGE_IN_MIN_SPEECH_MS", "120"))  # Speech needed to interrupt
+    BARGE_IN_ECHO_MARGIN_DB = float(os.getenv("BARGE_IN_ECHO_MARGIN_DB", "6"))  # Speech must exceed expected echo
+    BARGE_IN_ECHO_WINDOW_MS = int(os.getenv("BARGE_IN_ECHO_WINDOW_MS", "300"))  # Playback-to-mic delay covered
+    
+    # Async Pipeline
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))  # Sentences buffered between LLM and TTS
+    PIPELINE_TURN_TIMEOUT = float(os.getenv("PIPELINE_TURN_TIMEOUT", "120"))  # Seconds allowed per reply
+    
+    # Interview Server
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8765"))
+    SERVER_MAX_SESSIONS = int(os.getenv("SERVER_MAX_SESSIONS", "8"))  # Further connections are turned away
+    SERVER_SESSION_MAX_AUDIO_SECONDS = float(os.getenv("SERVER_SESSION_MAX_AUDIO_SECONDS", "60"))  # Per-answer buffer
+    SERVER_STT_BATCHING = os.getenv("SERVER_STT_BATCHING", "true").lower() == "true"  # Batch concurrent answers
+    
+    # Batch Mode
+    BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0"))  # Worker processes (0 = one per CPU core)
+    
+    # Latency Metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"  # Per-stage spans + report table
+    METRICS_DIR = os.getenv("METRICS_DIR", "metrics")  # One <session>.jsonl file per interview
+    
+    # Evaluation
+    INCREMENTAL_EVALUATION = os.getenv("INCREMENTAL_EVALUATION", "true").lower() == "true"  # Score answers per turn
+    EVALUATION_WAIT_TIMEOUT = float(os.getenv("EVALUATION_WAIT_TIMEOUT", "30"))  # Max wait for the last scores
+    
+    # Session Journal
+    JOURNAL_DIR = os.getenv("JOURNAL_DIR", "sessions")  # One <session>.jsonl per interview
+    JOURNAL_FSYNC_EVERY = int(os.getenv("JOURNAL_FSYNC_EVERY", "4"))  # Records per fsync (0 = only on close)
+    
+    # Conversation Context
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "8000"))  # Max estimated input tokens per turn
+    CONTEXT_KEEP_TURNS = int(os.getenv("CONTEXT_KEEP_TURNS", "3"))  # Recent turns sent verbatim
+    
+    # Notes Retrieval
+    NOTES_RETRIEVAL = os.getenv("NOTES_RETRIEVAL", "true").lower() == "true"  # Send only relevant passages
+    NOTES_TOP_K = int(os.getenv("NOTES_TOP_K", "4"))  # Passages retrieved per turn
+    NOTES_CHUNK_WORDS = int(os.getenv("NOTES_CHUNK_WORDS", "150"))  # Max words per passage
+    NOTES_INDEX_DIR = os.getenv("NOTES_INDEX_DIR", os.path.join(".cache", "notes_index"))
+    
+    # Text-to-Speech
+    TTS_SAMPLE_RATE = int(os.getenv("TTS_SAMPLE_RATE", "16000"))  # Polly PCM supports 8000 or 16000
+    
+    # TTS Cache
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(".cache", "tts"))
+    TTS_CACHE_MEMORY_MB = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+    TTS_CACHE_DISK_MB = int(os.getenv("TTS_CACHE_DISK_MB", "512"))
+    
     # Audio Settings
     SAMPLE_RATE = 16000
     CHANNELS = 1
+    CAPTURE_BUFFER_SECONDS = float(os.getenv("CAPTURE_BUFFER_SECONDS", "90"))  # Ring buffer length
+    CAPTURE_PREROLL_MS = int(os.getenv("CAPTURE_PREROLL_MS", "300"))  # Audio kept from before each turn
+    
+    # Speech-to-Text
+    STT_ENGINE = os.getenv("STT_ENGINE", "whisper")  # "whisper", "faster-whisper" or "sarvam"
+    STT_MODEL_SIZE = os.getenv("STT_MODEL_SIZE", "small")  # Model size for local engines
+    SARVAM_SEGMENT_SECONDS = float(os.getenv("SARVAM_SEGMENT_SECONDS", "10"))  # Longer answers are split at pauses
+    SARVAM_MAX_PARALLEL = int(os.getenv("SARVAM_MAX_PARALLEL", "4"))  # Segments uploaded at once
+    SARVAM_TIMEOUT = float(os.getenv("SARVAM_TIMEOUT", "30"))  # Seconds per segment request
+    FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+    FASTER_WHISPER_BEAM_SIZE = int(os.getenv("FASTER_WHISPER_BEAM_SIZE", "1"))  # 1 = greedy (fastest)
+    
+    # Whisper Inference
+    WHISPER_QUANTIZE = os.getenv("WHISPER_QUANTIZE", "false").lower() == "true"  # int8 linear layers on CPU
+    TORCH_THREADS = int(os.getenv("TORCH_THREADS", "0"))  # Intra-op threads (0 = torch default)
+    TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", "0"))  # Inter-op threads (0 = torch default)
+    WHISPER_SELFCHECK_AUDIO = os.getenv("WHISPER_SELFCHECK_AUDIO", os.path.join("assets", "whisper_selfcheck.wav"))
+    WHISPER_BATCH_WINDOW_MS = float(os.getenv("WHISPER_BATCH_WINDOW_MS", "50"))  # Wait for more utterances to batch
+    WHISPER_BATCH_MAX_SIZE = int(os.getenv("WHISPER_BATCH_MAX_SIZE", "8"))  # Utterances decoded per pass
+    WHISPER_SELFCHECK_MAX_WER = float(os.getenv("WHISPER_SELFCHECK_MAX_WER", "0.15"))  # Max drift from fp32
+    
+    # Voice Activity Detection
+    SILENCE_DURATION = int(os.getenv("SILENCE_THRESHOLD_MS", "1500")) / 1000  # End-of-speech silence (seconds)
+    VAD_SNR_DB = float(os.getenv("VAD_SNR_DB", "10"))  # Speech must be this far above the noise floor
+    VAD_MIN_RMS = float(os.getenv("VAD_MIN_RMS", "200"))  # Absolute minimum speech energy
+    VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "200"))  # Keep speech state through short gaps
     
     # File Paths
     NOTES_PATH = "Notes.txt"  # Study material for interview questions
@@ -27,7 +134,7 @@ class Config:
     @classmethod
     def validate(cls):
         """Validate required configuration."""
-        if not cls.SARVAM_API_KEY:
+        if cls.STT_ENGINE == "sarvam" and not cls.SARVAM_API_KEY:
             raise ValueError("SARVAM_API_KEY not set in .env file")
         if not os.path.exists(cls.NOTES_PATH):
             raise ValueError(f"Notes file not found: {cls.NOTES_PATH}")
@@ -0,0 +1,104 @@
+"""Token-budgeted conversation context for Bedrock requests."""
+import threading
+from .config import Config
+
+class ConversationContext:
+    """
+    Keep each Bedrock request within an input-token budget.
+
+    The last few turns are sent verbatim. Older turns are folded into a
+    compact running summary that is refreshed on a background thread and
+    appended to the system prompt. The full history is never modified, so
+    reports still see every turn.
+    """
+
+    def __init__(self, summarize, token_budget=Config.CONTEXT_TOKEN_BUDGET,
+                 keep_turns=Config.CONTEXT_KEEP_TURNS):
+        """
+        Args:
+            summarize: callable(previous_summary, messages) -> str or None
+            token_budget: maximum estimated input tokens per request
+            keep_turns: number of recent question/answer turns sent verbatim
+        """
+        self.summarize = summarize
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+
+        self.summary = ""
+        self.summarized_upto = 0  # History entries already folded into the summary
+        self.lock = threading.Lock()
+        self.refresh_thread = None
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token for English)."""
+        return len(text) // 4 + 1
+
+    def _message_tokens(self, message) -> int:
+        return sum(self.estimate_tokens(block.get("text", "")) for block in message["content"])
+
+    def _window_start(self, history) -> int:
+        """Index where the verbatim window begins (always a user message)."""
+        start = max(0, len(history) - (2 * self.keep_turns + 1))
+        # History alternates user/assistant starting with a user message
+        return start + (start % 2)
+
+    def build(self, history, system_prompt: str):
+        """
+        Return (system_text, messages) for the next request.
+        history must end with the user message being answered.
+        """
+        start = self._window_start(history)
+        with self.lock:
+            summary = self.summary
+            summarized_upto = self.summarized_upto
+
+        system_text = system_prompt
+        if summary:
+            system_text += f"\n\nINTERVIEW SO FAR (summary of earlier turns):\n{summary}"
+
+        remaining = self.token_budget - self.estimate_tokens(system_text)
+        recent = list(history[start:])
+        tokens = sum(self._message_tokens(message) for message in recent)
+
+        # Drop whole turns from the front until the window fits (keep the last message)
+        while tokens > remaining and len(recent) > 1:
+            for message in recent[:2]:
+                tokens -= self._message_tokens(message)
+            recent = recent[2:]
+        remaining -= tokens
+
+        # Older turns not yet in the summary are sent verbatim while they fit
+        older = []
+        for index in range(start - 2, summarized_upto - 1, -2):
+            pair = history[index:index + 2]
+            pair_tokens = sum(self._message_tokens(message) for message in pair)
+            if pair_tokens > remaining or len(recent) < len(history) - start:
+                break
+            older = pair + older
+            remaining -= pair_tokens
+
+        self._maybe_refresh(history, start)
+        return system_text, older + recent
+
+    def _maybe_refresh(self, history, upto: int):
+        """Fold turns that left the verbatim window into the summary in the background."""
+        with self.lock:
+            if upto <= self.summarized_upto:
+                return
+            if self.refresh_thread and self.refresh_thread.is_alive():
+                return
+            previous = self.summary
+            messages = list(history[self.summarized_upto:upto])
+            self.refresh_thread = threading.Thread(
+                target=self._refresh, args=(previous, messages, upto), daemon=True
+            )
+            self.refresh_thread.start()
+
+    def _refresh(self, previous: str, messages, upto: int):
+        summary = self.summarize(previous, messages)
+        if not summary:
+            return
+        with self.lock:
+            self.summary = summary.strip()
+            self.summarized_upto = upto
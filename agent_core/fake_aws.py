@@ -0,0 +1,81 @@
+"""Local stand-ins for the Bedrock and Polly clients, used by the benchmark."""
+import time
+
+DEFAULT_REPLY = (
+    "That is a good start. Can you explain how you would confirm that the alert is a true positive? "
+    "Also, which logs would you collect first, and why?"
+)
+
+
+class _FakeAudioStream:
+    """Mimics botocore's StreamingBody.iter_chunks with a fixed byte rate."""
+
+    def __init__(self, data: bytes, first_byte: float, bytes_per_second: float):
+        self.data = data
+        self.first_byte = first_byte
+        self.bytes_per_second = bytes_per_second
+
+    def iter_chunks(self, chunk_size=4096):
+        time.sleep(self.first_byte)
+        for offset in range(0, len(self.data), chunk_size):
+            chunk = self.data[offset:offset + chunk_size]
+            time.sleep(len(chunk) / self.bytes_per_second)
+            yield chunk
+
+
+class FakeBedrockClient:
+    """
+    bedrock-runtime stand-in answering converse/converse_stream with a
+    canned reply after ttft seconds, then streaming it at tokens_per_second
+    (one token is about four characters).
+    """
+
+    def __init__(self, ttft=0.35, tokens_per_second=60.0, reply=DEFAULT_REPLY):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply
+        self.calls = 0
+
+    def _tokens(self):
+        return [self.reply[i:i + 4] for i in range(0, len(self.reply), 4)]
+
+    def converse(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.ttft + len(self._tokens()) / self.tokens_per_second)
+        return {
+            "output": {"message": {"role": "assistant", "content": [{"text": self.reply}]}},
+            "usage": {"inputTokens": 0, "outputTokens": len(self._tokens())},
+        }
+
+    def converse_stream(self, **kwargs):
+        self.calls += 1
+
+        def events():
+            time.sleep(self.ttft)
+            yield {"messageStart": {"role": "assistant"}}
+            for token in self._tokens():
+                yield {"contentBlockDelta": {"delta": {"text": token}, "contentBlockIndex": 0}}
+                time.sleep(1 / self.tokens_per_second)
+            yield {"messageStop": {"stopReason": "end_turn"}}
+
+        return {"stream": events()}
+
+
+class FakePollyClient:
+    """
+    Polly stand-in returning silent PCM sized like real speech
+    (seconds_per_char of audio per character), delivered after first_byte
+    seconds and then synthesize_speed times faster than real time.
+    """
+
+    def __init__(self, first_byte=0.12, synthesize_speed=8.0, seconds_per_char=0.065):
+        self.first_byte = first_byte
+        self.synthesize_speed = synthesize_speed
+        self.seconds_per_char = seconds_per_char
+        self.calls = 0
+
+    def synthesize_speech(self, Text, SampleRate="16000", **kwargs):
+        self.calls += 1
+        rate = int(SampleRate)
+        data = bytes(int(len(Text) * self.seconds_per_char * rate) * 2)
+        return {"AudioStream": _FakeAudioStream(data, self.first_byte, rate * 2 * self.synthesize_speed)}
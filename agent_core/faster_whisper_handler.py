@@ -0,0 +1,58 @@
+import numpy as np
+from .config import Config
+from .stt_engine import STTEngine, pcm_to_float
+
+class FasterWhisperHandler(STTEngine):
+    """Handle Speech-to-Text using faster-whisper (CTranslate2) on CPU or GPU."""
+    
+    name = "faster-whisper"
+    
+    def __init__(self, model_size=Config.STT_MODEL_SIZE, compute_type=Config.FASTER_WHISPER_COMPUTE_TYPE, capture=True):
+        """
+        Args:
+            model_size: Whisper model name ("tiny" ... "large-v3") or a converted model path
+            compute_type: CTranslate2 compute type, e.g. "int8", "int8_float16", "float16"
+            capture: set up the local microphone
+        """
+        super().__init__(capture)
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.model = None
+
+    def load(self):
+        """Load the CTranslate2 model."""
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("faster-whisper is not installed. Install with: pip install faster-whisper")
+        
+        try:
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        except ImportError:
+            device = "cpu"
+        
+        print(f"Loading faster-whisper model ({self.model_size}, {self.compute_type})...")
+        self.model = WhisperModel(
+            self.model_size,
+            device=device,
+            compute_type=self.compute_type,
+            cpu_threads=Config.TORCH_THREADS  # 0 lets CTranslate2 choose
+        )
+        print(f"[OK] faster-whisper {self.model_size} loaded on {device}")
+
+    def transcribe(self, samples: np.ndarray, prompt: str = None) -> str:
+        """Transcribe int16 PCM samples, optionally conditioned on preceding text."""
+        try:
+            segments, _ = self.model.transcribe(
+                pcm_to_float(samples),
+                language="en",
+                beam_size=Config.FASTER_WHISPER_BEAM_SIZE,
+                initial_prompt=prompt
+            )
+            # segments is a lazy generator; decoding happens while joining
+            return "".join(segment.text for segment in segments).strip()
+            
+        except Exception as e:
+            print(f"faster-whisper Transcription Error: {e}")
+            return ""
@@ -0,0 +1,265 @@
+"""WebSocket server running many interview sessions on one shared STT model."""
+import json
+import time
+import uuid
+import asyncio
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from websockets.asyncio.server import serve
+from .config import Config
+from .vad import VoiceActivityDetector
+from .notes_index import NotesIndex
+from .stt_engine import create_stt_engine
+from .bedrock_handler import BedrockHandler
+from .bedrock_client import ResilientBedrockClient
+from .model_router import ModelRouter
+from .polly_handler import PollyHandler
+from .pipeline import EXIT_COMMANDS
+from .metrics import create_metrics
+
+# Close code for "try again later" (server at capacity)
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class InterviewSession:
+    """
+    Per-connection interview state.
+
+    Holds the session's own BedrockHandler and VAD, plus a preallocated
+    utterance buffer capped at SERVER_SESSION_MAX_AUDIO_SECONDS so one
+    candidate can never grow the server's memory.
+    """
+
+    def __init__(self, websocket, brain: BedrockHandler, rate=Config.SAMPLE_RATE):
+        self.id = uuid.uuid4().hex[:8]
+        self.websocket = websocket
+        self.brain = brain
+        self.rate = rate
+        self.vad = VoiceActivityDetector(rate)
+        self.buffer = np.zeros(int(Config.SERVER_SESSION_MAX_AUDIO_SECONDS * rate), dtype=np.int16)
+        self.length = 0
+        self.busy = False  # True while a turn is being transcribed and answered
+        self.question_count = 0
+        self.finished = asyncio.Event()
+        self.turn_task = None
+        self.metrics = create_metrics(self.id)
+        self.end_of_speech_at = None
+        brain.metrics = self.metrics
+
+    def feed(self, pcm: bytes) -> bool:
+        """
+        Append int16 PCM to the utterance and run VAD on it.
+        Returns True when the answer is complete (silence after speech or buffer full).
+        """
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype=np.int16)
+        samples = samples[:len(self.buffer) - self.length]
+        self.buffer[self.length:self.length + len(samples)] = samples
+        self.length += len(samples)
+        self.vad.process(samples)
+
+        if self.vad.has_speech and self.vad.trailing_silence >= Config.SILENCE_DURATION:
+            return True
+        return self.length >= len(self.buffer)
+
+    def take_utterance(self) -> np.ndarray:
+        """Return a copy of the buffered answer and start a new one."""
+        self.end_of_speech_at = time.perf_counter()
+        if self.vad.has_speech:
+            self.metrics.next_turn()
+            self.metrics.record("vad_endpoint", self.vad.trailing_silence)
+        samples = self.buffer[:self.length].copy() if self.vad.has_speech else self.buffer[:0]
+        self.length = 0
+        self.vad.reset()
+        return samples
+
+    async def send_json(self, message_type: str, **fields):
+        await self.websocket.send(json.dumps({"type": message_type, **fields}))
+
+
+class InterviewServer:
+    """
+    Serve concurrent interview sessions over WebSocket.
+
+    The STT model, the Bedrock and Polly clients and the notes index are
+    created once per process and shared. Every session gets its own
+    BedrockHandler (conversation history) and VAD state.
+
+    Protocol:
+        client -> server: binary frames of 16 kHz mono int16 PCM;
+                          text {"type": "end"} to finish early
+        server -> client: text {"type": "ready" | "question" | "transcript" |
+                          "audio_end" | "report", ...}; binary frames of
+                          int16 PCM at Config.TTS_SAMPLE_RATE
+    """
+
+    def __init__(self, host=Config.SERVER_HOST, port=Config.SERVER_PORT,
+                 max_sessions=Config.SERVER_MAX_SESSIONS):
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.sessions = {}
+
+        self.stt = None
+        self.polly = None
+        self.bedrock_client = None
+        self.model_router = None
+        self.notes_text = ""
+        self.notes_index = None
+
+        # Bedrock and Polly calls run concurrently across sessions; the STT
+        # executor is sized in load() once we know whether the engine batches
+        self.stt_executor = None
+        self.io_executor = ThreadPoolExecutor(max_workers=max_sessions * 2, thread_name_prefix="session")
+
+    def load(self):
+        """Load the notes, the shared STT model and the AWS clients."""
+        with open(Config.NOTES_PATH, 'r', encoding='utf-8') as f:
+            self.notes_text = f.read()
+        if Config.NOTES_RETRIEVAL:
+            self.notes_index = NotesIndex(self.notes_text)
+        self.stt = create_stt_engine(capture=False)
+        if Config.SERVER_STT_BATCHING and self.stt.enable_batching():
+            # Concurrent answers are grouped into one batched decode
+            self.stt_executor = ThreadPoolExecutor(max_workers=self.max_sessions, thread_name_prefix="stt")
+            print(f"[OK] STT batching: {Config.WHISPER_BATCH_WINDOW_MS:.0f} ms window, "
+                  f"up to {Config.WHISPER_BATCH_MAX_SIZE} utterances")
+        else:
+            # Whisper's kv-cache hooks are not thread-safe: decode one utterance at a time
+            self.stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        self.polly = PollyHandler(playback=False)
+        # Shared so every session benefits from the same latency percentiles and routing state
+        self.bedrock_client = ResilientBedrockClient()
+        self.model_router = ModelRouter()
+        print(f"[OK] Server ready: {self.stt.name} model shared by up to {self.max_sessions} sessions")
+
+    async def serve_forever(self):
+        # max_size bounds a single incoming frame; the utterance buffer bounds the rest
+        async with serve(self.handle, self.host, self.port, max_size=2 ** 20) as server:
+            print(f"🌐 Listening on ws://{self.host}:{self.port}")
+            await server.serve_forever()
+
+    def _run(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self.io_executor, fn, *args)
+
+    async def handle(self, websocket):
+        """Run one interview session for a connected client."""
+        if len(self.sessions) >= self.max_sessions:
+            await websocket.close(CLOSE_TRY_AGAIN_LATER, "Server at capacity")
+            return
+
+        brain = BedrockHandler(client=self.bedrock_client, router=self.model_router)
+        session = InterviewSession(websocket, brain)
+        self.sessions[session.id] = session
+        print(f"[OK] Session {session.id} started ({len(self.sessions)} active)")
+
+        try:
+            await self._run(brain.initialize_interview, self.notes_text, self.notes_index)
+            await session.send_json("ready", session=session.id)
+
+            session.busy = True
+            await self._speak(session, self._sentences(brain))
+            session.question_count = 1
+            session.busy = False
+
+            receiver = asyncio.ensure_future(self._receive(session))
+            await session.finished.wait()
+            receiver.cancel()
+            if session.turn_task:
+                await session.turn_task
+
+            report_path = await self._run(brain.generate_report, session.id)
+            await session.send_json("report", path=report_path)
+            await websocket.close()
+        except Exception as e:
+            print(f"[ERROR] Session {session.id}: {e}")
+        finally:
+            session.metrics.close()
+            del self.sessions[session.id]
+            print(f"[OK] Session {session.id} closed ({len(self.sessions)} active)")
+
+    async def _receive(self, session: InterviewSession):
+        """Read client frames until the session ends; audio sent during a reply is dropped."""
+        try:
+            async for message in session.websocket:
+                if isinstance(message, str):
+                    if json.loads(message).get("type") == "end":
+                        break
+                    continue
+                if session.busy:
+                    continue
+                if session.feed(message):
+                    session.busy = True
+                    session.turn_task = asyncio.ensure_future(self._turn(session, session.take_utterance()))
+        except Exception as e:
+            print(f"[WARN] Session {session.id} connection lost: {e}")
+        session.finished.set()
+
+    async def _turn(self, session: InterviewSession, samples: np.ndarray):
+        """Transcribe one answer and speak the interviewer's reply."""
+        try:
+            if not len(samples):
+                return
+            loop = asyncio.get_running_loop()
+            with session.metrics.span("stt", engine=self.stt.name, audio_s=round(len(samples) / session.rate, 2)):
+                answer = await loop.run_in_executor(self.stt_executor, self.stt.transcribe, samples)
+            if not answer:
+                return
+            await session.send_json("transcript", text=answer)
+
+            if any(cmd in answer.lower() for cmd in EXIT_COMMANDS):
+                session.finished.set()
+                return
+
+            brain = session.brain
+            await self._speak(session, self._sentences(brain, answer))
+            session.metrics.record("turn", time.perf_counter() - session.end_of_speech_at)
+            session.question_count += 1
+            if session.question_count >= Config.MAX_QUESTIONS:
+                session.finished.set()
+        except Exception as e:
+            print(f"[ERROR] Session {session.id} turn failed: {e}")
+        finally:
+            session.busy = False
+
+    @staticmethod
+    def _sentences(brain: BedrockHandler, user_answer: str = None):
+        """Reply sentences from Bedrock (the first question when user_answer is None)."""
+        if Config.STREAM_RESPONSES:
+            yield from (brain.stream_response(user_answer) if user_answer else brain.stream_first_question())
+        else:
+            yield brain.get_response(user_answer) if user_answer else brain.get_first_question()
+
+    async def _speak(self, session: InterviewSession, sentences):
+        """Send each reply sentence as text followed by its synthesized PCM."""
+        loop = asyncio.get_running_loop()
+        first_audio = []
+
+        def send_audio(sentence):
+            # Forward Polly chunks as they arrive; blocking here applies backpressure
+            with session.metrics.span("tts_synthesis", chars=len(sentence)):
+                for chunk in self.polly.stream_audio(sentence):
+                    if not first_audio and session.end_of_speech_at:
+                        first_audio.append(True)
+                        session.metrics.record("first_audio", time.perf_counter() - session.end_of_speech_at)
+                    asyncio.run_coroutine_threadsafe(session.websocket.send(chunk), loop).result()
+
+        try:
+            while True:
+                sentence = await self._run(next, sentences, None)
+                if sentence is None:
+                    break
+                if not sentence:
+                    continue
+                await session.send_json("question", text=sentence)
+                await self._run(send_audio, sentence)
+        finally:
+            # Closing the generator records the (possibly partial) reply in history
+            await self._run(sentences.close)
+        await session.send_json("audio_end", sample_rate=self.polly.sample_rate)
+
+    def shutdown(self):
+        if self.stt_executor:
+            self.stt_executor.shutdown(wait=False)
+        self.io_executor.shutdown(wait=False)
+        if self.stt:
+            self.stt.close()
@@ -0,0 +1,127 @@
+"""Per-turn latency spans written as JSONL, with percentile summaries."""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from .config import Config
+
+# Report order; other span names follow alphabetically
+STAGES = ["vad_endpoint", "stt", "llm_ttft", "llm_total", "tts_first_chunk", "tts_synthesis", "first_audio", "speak_first_audio", "turn", "barge_in"]
+
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullMetrics:
+    """Recorder used when metrics are disabled: every call is a no-op."""
+
+    enabled = False
+    turn = 0
+
+    def span(self, name, **fields):
+        return _NULL_SPAN
+
+    def record(self, name, seconds, **fields):
+        pass
+
+    def next_turn(self):
+        pass
+
+    def format_summary(self) -> str:
+        return ""
+
+    def close(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class MetricsRecorder:
+    """
+    Record stage durations for one interview session.
+
+    Each span is appended to metrics/<session>.jsonl as
+    {"ts", "session", "turn", "stage", "ms", ...}. Durations are also kept
+    in memory for the p50/p95/p99 table added to the report.
+    """
+
+    enabled = True
+
+    def __init__(self, session_id: str = None, metrics_dir=Config.METRICS_DIR):
+        self.session_id = session_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.turn = 0
+        self.durations = {}
+        self.lock = threading.Lock()
+        os.makedirs(metrics_dir, exist_ok=True)
+        self.path = os.path.join(metrics_dir, f"{self.session_id}.jsonl")
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def next_turn(self):
+        """Start numbering spans for the next question/answer turn."""
+        with self.lock:
+            self.turn += 1
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        """Time the enclosed block as stage name."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    def record(self, name: str, seconds: float, **fields):
+        """Record an already measured duration."""
+        with self.lock:
+            self.durations.setdefault(name, []).append(seconds)
+            entry = {"ts": round(time.time(), 3), "session": self.session_id, "turn": self.turn,
+                     "stage": name, "ms": round(seconds * 1000, 1), **fields}
+            if self.file:
+                self.file.write(json.dumps(entry) + "\n")
+                self.file.flush()
+
+    def summary(self) -> dict:
+        """Stage -> count and p50/p95/p99 in milliseconds."""
+        with self.lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+        order = {name: i for i, name in enumerate(STAGES)}
+        return {
+            name: {"count": len(values), **{f"p{q}": percentile(values, q) * 1000 for q in (50, 95, 99)}}
+            for name, values in sorted(durations.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+        }
+
+    def format_summary(self) -> str:
+        """Plain-text latency table for the report."""
+        lines = [f"{'stage':<18}{'count':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<18}{stats['count']:>6}{stats['p50']:>10.0f}{stats['p95']:>10.0f}{stats['p99']:>10.0f}")
+        return "\n".join(lines) + f"\n\nRaw spans: {self.path}"
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+
+def create_metrics(session_id: str = None):
+    """A MetricsRecorder when METRICS_ENABLED, otherwise the shared no-op recorder."""
+    return MetricsRecorder(session_id) if Config.METRICS_ENABLED else NULL_METRICS
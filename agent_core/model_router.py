@@ -0,0 +1,119 @@
+"""Per-call Bedrock model selection with a latency-budget fallback."""
+import threading
+from .config import Config
+from .bedrock_client import LatencyTracker
+
+# Calls the candidate is waiting on; the rest run in the background
+INTERACTIVE_CALLS = {"turn", "hard_followup"}
+
+
+class ModelRouter:
+    """
+    Choose the Bedrock model for each call type.
+
+    Interactive turns go to MODEL_FAST. Hard follow-ups, per-answer scoring
+    and the report go to MODEL_LARGE. The running summary also uses
+    MODEL_FAST. Latency is tracked per model: time to first token for
+    interactive calls and total time for background ones. When a model's
+    recent p90 is over budget, calls switch to the other model. Every
+    MODEL_PROBE_EVERY-th of those calls (unless it is 0) still goes to the
+    preferred model, and a probe that comes back within budget switches
+    calls back to it.
+
+    One router can be shared by several BedrockHandlers.
+    """
+
+    def __init__(self, fast=Config.MODEL_FAST, large=Config.MODEL_LARGE, enabled=Config.MODEL_ROUTING):
+        self.fast = fast
+        self.large = large
+        self.enabled = enabled
+        if enabled:
+            self.routes = {"turn": fast, "hard_followup": large, "summary": fast,
+                           "evaluation": large, "report": large}
+        else:
+            self.routes = dict.fromkeys(["turn", "hard_followup", "summary", "evaluation", "report"], large)
+        self.budgets = {"interactive": Config.MODEL_TURN_BUDGET, "background": Config.MODEL_BACKGROUND_BUDGET}
+        self.latency = {}    # (model_id, kind) -> LatencyTracker
+        self.skipped = {}    # (model_id, kind) -> calls routed away while over budget
+        self.decisions = {}  # (call, model_id, reason) -> count
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def kind(call: str) -> str:
+        return "interactive" if call in INTERACTIVE_CALLS else "background"
+
+    @staticmethod
+    def reply_call(answer: str) -> str:
+        """Call type for replying to an answer: long, detailed answers get a harder follow-up."""
+        return "hard_followup" if len(answer.split()) >= Config.MODEL_HARD_ANSWER_WORDS else "turn"
+
+    def describe(self) -> str:
+        if not self.enabled or self.fast == self.large:
+            return self.large
+        return f"fast: {self.fast}, large: {self.large}"
+
+    def _tracker(self, model_id: str, kind: str) -> LatencyTracker:
+        with self.lock:
+            if (model_id, kind) not in self.latency:
+                self.latency[(model_id, kind)] = LatencyTracker(window=Config.MODEL_LATENCY_WINDOW, min_samples=3)
+            return self.latency[(model_id, kind)]
+
+    def over_budget(self, model_id: str, kind: str) -> bool:
+        budget = self.budgets[kind]
+        recent = self._tracker(model_id, kind).percentile(90)
+        return bool(budget) and recent is not None and recent > budget
+
+    def choose(self, call: str):
+        """Return (model_id, reason) for one call; reason is "route", "fallback" or "probe"."""
+        preferred = self.routes[call]
+        model_id, reason = preferred, "route"
+        if self.enabled:
+            kind = self.kind(call)
+            other = self.large if preferred == self.fast else self.fast
+            if other != preferred and self.over_budget(preferred, kind) and not self.over_budget(other, kind):
+                with self.lock:
+                    skipped = self.skipped.get((preferred, kind), 0) + 1
+                    self.skipped[(preferred, kind)] = skipped
+                if Config.MODEL_PROBE_EVERY and skipped % Config.MODEL_PROBE_EVERY == 0:
+                    reason = "probe"
+                else:
+                    model_id, reason = other, "fallback"
+        with self.lock:
+            key = (call, model_id, reason)
+            self.decisions[key] = self.decisions.get(key, 0) + 1
+        return model_id, reason
+
+    def record(self, model_id: str, call: str, seconds: float, reason: str = "route"):
+        """Record one call's latency (failed calls count with the time they took)."""
+        kind = self.kind(call)
+        tracker = self._tracker(model_id, kind)
+        if reason == "probe" and not (self.budgets[kind] and seconds > self.budgets[kind]):
+            # The model has recovered: forget the slow calls that made us route away
+            with tracker.lock:
+                tracker.samples.clear()
+            with self.lock:
+                self.skipped.pop((model_id, kind), None)
+        tracker.add(seconds)
+
+    def summary(self) -> str:
+        with self.lock:
+            decisions = dict(self.decisions)
+            trackers = dict(self.latency)
+        if not decisions:
+            return "no calls"
+        parts = []
+        for call in ["turn", "hard_followup", "summary", "evaluation", "report"]:
+            counts = {}
+            for (name, model_id, reason), count in decisions.items():
+                if name == call:
+                    counts[model_id] = counts.get(model_id, 0) + count
+            fallbacks = sum(count for (name, _, reason), count in decisions.items()
+                            if name == call and reason == "fallback")
+            if counts:
+                models = ", ".join(f"{model_id} x{count}" for model_id, count in counts.items())
+                parts.append(f"{call} -> {models}" + (f" ({fallbacks} fallback)" if fallbacks else ""))
+        for (model_id, kind), tracker in sorted(trackers.items()):
+            recent = tracker.percentile(90)
+            if recent is not None:
+                parts.append(f"{model_id} {kind} p90 {recent:.2f}s")
+        return "; ".join(parts)
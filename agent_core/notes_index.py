@@ -0,0 +1,165 @@
+"""Local BM25 retrieval index over the study notes."""
+import os
+import re
+import json
+import math
+import heapq
+import hashlib
+from collections import Counter, defaultdict
+from .config import Config
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its of on or "
+    "so that the their them then there these this to was we what when which who why will "
+    "with you your".split()
+)
+INDEX_VERSION = 1
+
+
+def tokenize(text: str):
+    """Lowercase word tokens with stopwords removed."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_notes(text: str, max_words=Config.NOTES_CHUNK_WORDS):
+    """
+    Split notes into passages of at most max_words words.
+    Consecutive short paragraphs are merged; long ones are split.
+    """
+    chunks = []
+    current = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        words = paragraph.split()
+        if not words:
+            continue
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        while len(words) > max_words:
+            chunks.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        current.extend(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class NotesIndex:
+    """
+    BM25 index over chunks of the notes file, persisted on disk.
+
+    Index files are keyed by the hash of the notes. When the notes change,
+    term counts for unchanged chunks are reused from the previous index so
+    only edited passages are re-tokenized.
+    """
+
+    def __init__(self, notes_text: str, index_dir=Config.NOTES_INDEX_DIR, k1=1.5, b=0.75):
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+        self.notes_hash = _hash(notes_text)
+        self.reused = 0
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        path = os.path.join(self.index_dir, f"{self.notes_hash}.json")
+        chunks = self._load(path)
+        if chunks is None:
+            chunks = self._build(notes_text)
+            self._save(path, chunks)
+
+        self.texts = [chunk["text"] for chunk in chunks]
+        self._prepare([chunk["tf"] for chunk in chunks])
+
+    def _load(self, path: str):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.reused = len(data["chunks"])
+                return data["chunks"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _previous_chunks(self):
+        """Map chunk hash -> term counts from any earlier index on disk."""
+        previous = {}
+        for name in os.listdir(self.index_dir):
+            if not name.endswith(".json") or name.startswith(self.notes_hash):
+                continue
+            try:
+                with open(os.path.join(self.index_dir, name), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    previous.update({chunk["hash"]: chunk["tf"] for chunk in data["chunks"]})
+            except (OSError, ValueError, KeyError):
+                continue
+        return previous
+
+    def _build(self, notes_text: str):
+        previous = self._previous_chunks()
+        chunks = []
+        for text in chunk_notes(notes_text):
+            chunk_hash = _hash(text)
+            tf = previous.get(chunk_hash)
+            if tf is None:
+                tf = dict(Counter(tokenize(text)))
+            else:
+                self.reused += 1
+            chunks.append({"hash": chunk_hash, "text": text, "tf": tf})
+        return chunks
+
+    def _save(self, path: str, chunks):
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "notes_hash": self.notes_hash, "chunks": chunks}, f)
+            os.replace(tmp_path, path)
+            # Only the current index is needed once its chunks have been reused
+            for name in os.listdir(self.index_dir):
+                if name.endswith(".json") and not name.startswith(self.notes_hash):
+                    os.remove(os.path.join(self.index_dir, name))
+        except OSError as e:
+            print(f"[WARN] Could not save notes index: {e}")
+
+    def _prepare(self, term_counts):
+        """Build postings lists and IDF weights from per-chunk term counts."""
+        self.doc_lengths = [sum(tf.values()) for tf in term_counts]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+        self.postings = defaultdict(list)
+        for doc_id, tf in enumerate(term_counts):
+            for term, count in tf.items():
+                self.postings[term].append((doc_id, count))
+        n_docs = len(term_counts)
+        self.idf = {
+            term: math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, query: str, k=Config.NOTES_TOP_K):
+        """
+        Return the k passages most relevant to query, in document order.
+        With no usable query terms the opening passages are returned.
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, count in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * count * (self.k1 + 1) / (count + norm)
+
+        if scores:
+            top = heapq.nlargest(k, scores, key=scores.get)
+        else:
+            top = range(min(k, len(self.texts)))
+        return [self.texts[doc_id] for doc_id in sorted(top)]
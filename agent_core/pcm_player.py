@@ -0,0 +1,141 @@
+"""Streaming PCM playback on a persistent output stream."""
+import time
+import queue
+import threading
+from collections import deque
+import numpy as np
+import pyaudio
+from .config import Config
+from .audio_capture import create_pyaudio
+
+# Marks the end of an utterance in the playback queue
+_END = object()
+
+
+class _Mark:
+    """Queue entry recording that playback reached a label (e.g. a sentence)."""
+
+    def __init__(self, label):
+        self.label = label
+
+
+class PCMStreamPlayer:
+    """
+    Play 16-bit mono PCM chunks as they arrive.
+
+    One output stream stays open for the whole session. A writer thread
+    drains a queue of chunks into it, so playback starts on the first chunk
+    and completion is signalled through an Event instead of polling.
+
+    The level of each piece written is kept with its time as a reference
+    for echo-robust barge-in detection. Marks queued between chunks record
+    which sentences were actually played before a stop().
+
+    Every queued item is tagged with the utterance (generation) it belongs
+    to. begin() starts a new generation and the writer drops older items,
+    so a producer thread left over from an interrupted reply cannot slip
+    stale audio into the next one.
+    """
+
+    def __init__(self, rate=Config.TTS_SAMPLE_RATE, frames_per_buffer=512, max_queued_chunks=32):
+        self.rate = rate
+        # Write in small pieces so stop() takes effect within a few milliseconds
+        self.piece_bytes = frames_per_buffer * 2
+        self.audio = create_pyaudio()
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            output=True,
+            frames_per_buffer=frames_per_buffer
+        )
+        # Bounded so producers block (backpressure) instead of buffering a whole reply
+        self.chunks = queue.Queue(maxsize=max_queued_chunks)
+        self.done = threading.Event()
+        self.done.set()
+        self.stopped = threading.Event()
+        self._carry = b""
+        self.generation = 0
+        self.levels = deque(maxlen=256)  # (monotonic time, RMS) of recently written pieces
+        self.heard = []  # Labels of marks reached in the current utterance
+        self.writer = threading.Thread(target=self._run, daemon=True)
+        self.writer.start()
+
+    def begin(self) -> int:
+        """Start a new utterance; returns its generation for write()/mark()/end()."""
+        self.generation += 1
+        self.stopped.clear()
+        self.done.clear()
+        self._carry = b""
+        self.heard = []
+        return self.generation
+
+    def write(self, chunk: bytes, generation: int = None):
+        """
+        Queue PCM bytes for playback (chunks may split a sample).
+        A chunk for an older generation than the current one is dropped.
+        """
+        generation = self.generation if generation is None else generation
+        if generation != self.generation:
+            return
+        chunk = self._carry + chunk
+        usable = len(chunk) - (len(chunk) % 2)
+        self._carry = chunk[usable:]
+        if usable:
+            self.chunks.put((generation, chunk[:usable]))
+
+    def mark(self, label, generation: int = None):
+        """Record label in heard once playback reaches this point (unless stopped first)."""
+        self.chunks.put((self.generation if generation is None else generation, _Mark(label)))
+
+    def reference_level(self, since: float) -> float:
+        """Loudest RMS among pieces written since the given monotonic time (0 if none)."""
+        return max((rms for at, rms in list(self.levels) if at >= since), default=0.0)
+
+    def end(self, generation: int = None):
+        """Mark the end of the current utterance."""
+        self.chunks.put((self.generation if generation is None else generation, _END))
+
+    def wait(self, timeout=None) -> bool:
+        """Block until the current utterance has finished playing."""
+        return self.done.wait(timeout)
+
+    def stop(self):
+        """Drop queued audio and cut the current utterance short."""
+        self.stopped.set()
+
+    def _run(self):
+        while True:
+            item = self.chunks.get()
+            if item is None:
+                break
+            generation, chunk = item
+            if generation != self.generation:
+                continue  # Left over from an utterance that was cut short
+            if chunk is _END:
+                self.done.set()
+                continue
+            if self.stopped.is_set():
+                continue
+            if isinstance(chunk, _Mark):
+                self.heard.append(chunk.label)
+                continue
+            for offset in range(0, len(chunk), self.piece_bytes):
+                if self.stopped.is_set() or generation != self.generation:
+                    break
+                piece = chunk[offset:offset + self.piece_bytes]
+                samples = np.frombuffer(piece, dtype=np.int16).astype(np.float32)
+                self.levels.append((time.monotonic(), float(np.sqrt(np.mean(samples * samples)))))
+                try:
+                    self.stream.write(piece)
+                except Exception as e:
+                    print(f"Playback Error: {e}")
+                    break
+
+    def close(self):
+        self.stop()
+        self.chunks.put(None)
+        self.writer.join(timeout=1.0)
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio.terminate()
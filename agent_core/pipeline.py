@@ -0,0 +1,243 @@
+"""Asyncio interview pipeline with overlapped STT, LLM, TTS and playback stages."""
+import time
+import asyncio
+import threading
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from .config import Config
+from .barge_in import BargeInMonitor, EchoRobustDetector
+
+EXIT_COMMANDS = ["end interview", "stop interview", "exit"]
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a stage thread when its turn has been cancelled."""
+
+
+class InterviewPipeline:
+    """
+    Run the interview loop on one asyncio event loop.
+
+    Each reply flows through separate stages joined by bounded queues:
+    LLM sentences -> TTS audio chunks -> playback. Blocking SDK calls
+    (boto3, Whisper, PyAudio) run in per-stage executors, so sentence 2 is
+    generated and synthesized while sentence 1 plays, and a full queue
+    pauses the stage feeding it (backpressure). With BARGE_IN the mic is
+    watched during playback and the reply is cut short when the candidate
+    starts talking.
+    """
+
+    def __init__(self, stt, brain, polly):
+        self.stt = stt
+        self.brain = brain
+        self.polly = polly
+        self.metrics = brain.metrics
+        self.echo_detector = None  # Shared by every reply's barge-in monitor, so the echo gain carries over
+
+        # One executor per stage so a slow stage never starves another
+        self.stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        self.llm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+        self.tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+        self.play_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="play")
+
+    async def run(self, question_count=1):
+        """Main interview loop: listen, then stream the reply, until MAX_QUESTIONS."""
+        barge_in_pos = None
+        while question_count < Config.MAX_QUESTIONS:
+            print(f"\n--- Question {question_count + 1} ---")
+
+            # Listen to user's answer (from where they interrupted the last reply, if they did)
+            print("🎤 Listening... (Speak now)")
+            self.metrics.next_turn()
+            user_answer = await self.listen(barge_in_pos)
+            barge_in_pos = None
+
+            if not user_answer:
+                self.brain.cancel_speculation()
+                print("⚠️  No speech detected. Please try again.")
+                continue
+
+            print(f"📝 You said: {user_answer}")
+
+            # Check for exit commands
+            if any(cmd in user_answer.lower() for cmd in EXIT_COMMANDS):
+                self.brain.cancel_speculation()
+                print("\n👋 Interview ended by user")
+                break
+
+            # Get AI response
+            print("\n🤖 Interviewer is thinking...")
+            barge_in_pos = await self.reply(user_answer)
+            if self.stt.end_of_speech_at:
+                # End of the candidate's answer to the end of the interviewer's reply
+                self.metrics.record("turn", time.perf_counter() - self.stt.end_of_speech_at)
+
+            question_count += 1
+
+        self.shutdown()
+
+    async def listen(self, start_pos=None) -> str:
+        """Capture and transcribe one answer on the STT executor."""
+        loop = asyncio.get_running_loop()
+
+        def on_partial(text):
+            print(f"   ... {text}")
+            if Config.SPECULATIVE_REPLIES and not self.stt.vad.in_speech:
+                # A pause may be the end of the answer: start the reply now
+                self.brain.speculate(text)
+
+        on_speech_resumed = self.brain.cancel_speculation if Config.SPECULATIVE_REPLIES else None
+        return await loop.run_in_executor(
+            self.stt_executor,
+            lambda: self.stt.listen_once(on_partial=on_partial, on_speech_resumed=on_speech_resumed,
+                                         start_pos=start_pos)
+        )
+
+    def _sentences(self, user_answer: str):
+        """Reply sentences from Bedrock, streamed or as one block."""
+        if Config.STREAM_RESPONSES:
+            yield from self.brain.stream_response(user_answer)
+        else:
+            yield self.brain.get_response(user_answer)
+
+    async def reply(self, user_answer: str):
+        """
+        Generate, synthesize and play the interviewer's reply with overlapped stages.
+        Returns the capture position where the candidate barged in, or None.
+        """
+        loop = asyncio.get_running_loop()
+        text_queue = asyncio.Queue(maxsize=Config.PIPELINE_QUEUE_SIZE)
+        audio_queue = asyncio.Queue(maxsize=Config.PIPELINE_QUEUE_SIZE * 8)
+        cancelled = threading.Event()
+        barged_in = asyncio.Event()
+        turn_start = time.perf_counter()
+        timings = {}
+
+        monitor = None
+        if Config.BARGE_IN and self.polly.player and self.stt.capture:
+            if not self.echo_detector:
+                self.echo_detector = EchoRobustDetector(self.stt.RATE, self.stt.vad.noise_floor)
+            # Started by the play stage once audio is actually playing
+            monitor = BargeInMonitor(self.stt, self.polly.player, lambda: loop.call_soon_threadsafe(barged_in.set),
+                                     detector=self.echo_detector)
+
+        stages = [
+            asyncio.ensure_future(self._llm_stage(user_answer, text_queue, cancelled)),
+            asyncio.ensure_future(self._tts_stage(text_queue, audio_queue, cancelled)),
+            asyncio.ensure_future(self._play_stage(audio_queue, turn_start, timings, monitor)),
+        ]
+        turn = asyncio.ensure_future(asyncio.wait_for(asyncio.gather(*stages), timeout=Config.PIPELINE_TURN_TIMEOUT))
+        interrupted = asyncio.ensure_future(barged_in.wait())
+        completed = False
+        try:
+            await asyncio.wait([turn, interrupted], return_when=asyncio.FIRST_COMPLETED)
+            if turn.done():
+                turn.result()
+                completed = True
+        except asyncio.TimeoutError:
+            print(f"\n⚠️  Reply timed out after {Config.PIPELINE_TURN_TIMEOUT:.0f}s")
+        except PipelineCancelled:
+            pass
+        finally:
+            # Stop stage threads; on an aborted turn also drop any audio still queued
+            if monitor:
+                monitor.stop()
+            cancelled.set()
+            interrupted.cancel()
+            turn.cancel()
+            for stage in stages:
+                stage.cancel()
+            if not completed and self.polly.player:
+                self.polly.player.stop()
+                self.polly.player.end()
+
+        if monitor and monitor.detected:
+            # Keep only what the candidate actually heard in the history
+            self.brain.mark_interrupted(" ".join(self.polly.player.heard))
+
+        if "first_audio" in timings:
+            if self.stt.end_of_speech_at:
+                # Measured from the end of the candidate's answer, so it includes STT
+                self.metrics.record("first_audio", timings["first_audio_at"] - self.stt.end_of_speech_at)
+            print(f"⏱️  First audio after {timings['first_audio']:.2f}s, "
+                  f"reply finished after {time.perf_counter() - turn_start:.2f}s")
+        return monitor.speech_start if monitor else None
+
+    def _put_threadsafe(self, loop, queue, item, cancelled):
+        """Put into an asyncio queue from a worker thread, blocking while it is full."""
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=0.2)
+                return
+            except concurrent.futures.TimeoutError:
+                if cancelled.is_set():
+                    future.cancel()
+                    raise PipelineCancelled()
+
+    async def _llm_stage(self, user_answer, text_queue, cancelled):
+        loop = asyncio.get_running_loop()
+
+        def produce():
+            sentences = self._sentences(user_answer)
+            print("🗣️  Interviewer: ", end="", flush=True)
+            try:
+                for sentence in sentences:
+                    if cancelled.is_set():
+                        break
+                    print(sentence, end=" ", flush=True)
+                    self._put_threadsafe(loop, text_queue, sentence, cancelled)
+            finally:
+                # Closing the generator records the (possibly partial) reply in history
+                sentences.close()
+                print()
+
+        await loop.run_in_executor(self.llm_executor, produce)
+        await text_queue.put(None)
+
+    async def _tts_stage(self, text_queue, audio_queue, cancelled):
+        loop = asyncio.get_running_loop()
+
+        def synthesize(sentence):
+            # The sentence itself marks where its audio starts (see _play_stage)
+            self._put_threadsafe(loop, audio_queue, sentence, cancelled)
+            for chunk in self.polly.stream_audio(sentence):
+                self._put_threadsafe(loop, audio_queue, chunk, cancelled)
+
+        while True:
+            sentence = await text_queue.get()
+            if sentence is None:
+                break
+            if sentence:
+                await loop.run_in_executor(self.tts_executor, synthesize, sentence)
+        await audio_queue.put(None)
+
+    async def _play_stage(self, audio_queue, turn_start, timings, monitor=None):
+        loop = asyncio.get_running_loop()
+        player = self.polly.player
+        if player:
+            generation = player.begin()
+        while True:
+            chunk = await audio_queue.get()
+            if chunk is None:
+                break
+            if not player:
+                continue
+            if isinstance(chunk, str):
+                # Sentence boundary: lets a barge-in tell which sentences were heard
+                await loop.run_in_executor(self.play_executor, player.mark, chunk, generation)
+                continue
+            if "first_audio" not in timings:
+                timings["first_audio_at"] = time.perf_counter()
+                timings["first_audio"] = timings["first_audio_at"] - turn_start
+                if monitor:
+                    monitor.start()
+            # player.write blocks while the player's own queue is full
+            await loop.run_in_executor(self.play_executor, player.write, chunk, generation)
+        if player:
+            player.end(generation)
+            await loop.run_in_executor(self.play_executor, player.wait)
+
+    def shutdown(self):
+        for executor in (self.stt_executor, self.llm_executor, self.tts_executor, self.play_executor):
+            executor.shutdown(wait=False)
@@ -1,47 +1,108 @@
-import boto3
-import pygame
-import io
 import time
+import boto3
+from .config import Config
+from .tts_cache import TTSCache
+from .pcm_player import PCMStreamPlayer
+from .metrics import NULL_METRICS
 
 class PollyHandler:
-    """Handle Text-to-Speech using AWS Polly with in-memory playback."""
-    
-    def __init__(self):
+    """Handle Text-to-Speech using AWS Polly with streaming PCM playback."""
+
+    def __init__(self, playback=True):
+        """
+        Args:
+            playback: open a local output device (False when audio is sent elsewhere, e.g. server mode)
+        """
         self.client = boto3.client('polly', region_name='us-east-1')
         self.voice_id = "Matthew" # Changed to Male Neural (optional)
         self.engine = "neural"
-        try:
-            pygame.mixer.init()
-        except Exception as e:
-            print(f"Audio Error: {e}")
+        self.output_format = "pcm"
+        self.sample_rate = Config.TTS_SAMPLE_RATE
+        self.cache = TTSCache() if Config.TTS_CACHE_ENABLED else None
+        self.metrics = NULL_METRICS  # Replaced by a MetricsRecorder when metrics are enabled
+        self.player = None
+        if playback:
+            try:
+                self.player = PCMStreamPlayer(self.sample_rate)
+            except Exception as e:
+                print(f"Audio Error: {e}")
 
-    def speak(self, text: str):
-        if not text: return
+    def stream_audio(self, text: str):
+        """
+        Yield raw PCM for text as it arrives from Polly's HTTP body,
+        or in one piece from the cache when enabled.
+        """
+        key = None
+        if self.cache:
+            key = TTSCache.make_key(text, self.voice_id, self.engine, f"{self.output_format}{self.sample_rate}")
+            cached = self.cache.get(key)
+            if cached:
+                yield cached
+                return
 
+        start = time.perf_counter()
         try:
             response = self.client.synthesize_speech(
                 Text=text,
-                OutputFormat='mp3',
+                OutputFormat=self.output_format,
+                SampleRate=str(self.sample_rate),
                 VoiceId=self.voice_id,
                 Engine=self.engine
             )
-
-            if "AudioStream" in response:
-                # Read stream into memory buffer
-                audio_stream = io.BytesIO(response['AudioStream'].read())
-                self._play_audio(audio_stream)
+            if "AudioStream" not in response:
+                return
+            parts = []
+            try:
+                for chunk in response['AudioStream'].iter_chunks(chunk_size=4096):
+                    if not parts:
+                        self.metrics.record("tts_first_chunk", time.perf_counter() - start)
+                    parts.append(chunk)
+                    yield chunk
+            finally:
+                # Also runs when the consumer stops early (barge-in), releasing the connection now
+                response['AudioStream'].close()
+            self.metrics.record("tts_synthesis", time.perf_counter() - start, chars=len(text))
+            if self.cache:
+                self.cache.put(key, b"".join(parts))
         except Exception as e:
             print(f"Polly Error: {e}")
 
-    def _play_audio(self, audio_buffer):
+    def speak(self, text: str):
+        if not text: return
+        self.speak_stream([text])
+
+    def speak_stream(self, sentences):
+        """
+        Speak an iterable of sentences as they are produced.
+        Audio is handed to the player as it arrives, so the next sentence
+        (e.g. from a streaming LLM reply) is fetched and synthesized while
+        earlier audio is still playing.
+        """
+        if not self.player:
+            # Still drain the iterable so streamed replies reach history
+            for _ in sentences:
+                pass
+            return
+
+        start = time.perf_counter()
+        first_audio = None
+        self.player.begin()
         try:
-            # Load directly from memory, no file creation needed
-            pygame.mixer.music.load(audio_buffer)
-            pygame.mixer.music.play()
-            
-            # Wait for playback
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-                
+            for sentence in sentences:
+                if not sentence:
+                    continue
+                for chunk in self.stream_audio(sentence):
+                    if first_audio is None:
+                        first_audio = time.perf_counter() - start
+                        # From speak_stream() start, so not mixed with the end-of-answer first_audio
+                        self.metrics.record("speak_first_audio", first_audio)
+                    self.player.write(chunk)
         except Exception as e:
-            print(f"Playback Error: {e}")
\ No newline at end of file
+            print(f"Polly Stream Error: {e}")
+        finally:
+            self.player.end()
+        self.player.wait()
+
+    def close(self):
+        if self.player:
+            self.player.close()
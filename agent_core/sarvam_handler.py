@@ -1,148 +1,145 @@
+import io
 import os
 import time
+import random
 import wave
-import tempfile
-import pyaudio
-import threading
-import queue
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import numpy as np
 from sarvamai import SarvamAI
 from .config import Config
+from .stt_engine import STTEngine
 
-class SarvamHandler:
-    """Handle Speech-to-Text using Sarvam AI (Record & Transcribe)."""
-    
-    def __init__(self):
+# Stands in for a segment whose upload failed, so the gap stays visible in the transcript
+INAUDIBLE = "[inaudible]"
+RETRY_DELAY = 0.5  # Upper bound (seconds) of the jittered wait before the retry
+
+
+class SarvamHandler(STTEngine):
+    """
+    Handle Speech-to-Text using Sarvam AI (Record & Transcribe).
+
+    Audio is encoded as WAV in memory. Answers longer than
+    SARVAM_SEGMENT_SECONDS are split at their quietest moments and the
+    segments are uploaded in parallel over one pooled HTTP client, so a
+    long answer takes about as long as its longest segment.
+    """
+
+    name = "Sarvam"
+
+    def __init__(self, capture=True):
+        super().__init__(capture)
+        self.client = None
+        self.http = None
+        self.executor = None
+        self.ROLLING_TRANSCRIPTION = False # One upload (or one parallel batch) per answer
+
+    def load(self):
+        """Create the Sarvam client and the segment upload pool."""
         api_key = os.getenv("SARVAM_API_KEY")
         if not api_key:
             print("Warning: SARVAM_API_KEY not found")
-            self.client = None
-        else:
-            self.client = SarvamAI(api_subscription_key=api_key)
-            
-        self.audio = pyaudio.PyAudio()
-        self.stream = None
-        self.is_listening = False
-        self.audio_queue = queue.Queue()
-        self.stop_event = threading.Event()
-        
-        # Audio config
-        self.CHUNK = 1024
-        self.FORMAT = pyaudio.paInt16
-        self.CHANNELS = 1
-        self.RATE = 16000
-        self.SILENCE_THRESHOLD = 500 # Amplitude
-        self.SILENCE_DURATION = 2.0 # Seconds of silence to trigger transcription
-        self.MAX_DURATION = 30.0 # Maximum recording duration in seconds
-
-    def start_listening(self):
-        """Start recording audio."""
-        self.is_listening = True
-        self.stop_event.clear()
-        self.stream = self.audio.open(
-            format=self.FORMAT,
-            channels=self.CHANNELS,
-            rate=self.RATE,
-            input=True,
-            frames_per_buffer=self.CHUNK
+            return
+        # One keep-alive pool shared by all segment uploads (the SDK client is thread-safe on top of it)
+        self.http = httpx.Client(
+            timeout=Config.SARVAM_TIMEOUT,
+            limits=httpx.Limits(max_connections=Config.SARVAM_MAX_PARALLEL,
+                                max_keepalive_connections=Config.SARVAM_MAX_PARALLEL)
         )
-        print("🎤 Listening... (Sarvam)")
+        self.client = SarvamAI(api_subscription_key=api_key, httpx_client=self.http)
+        self.executor = ThreadPoolExecutor(max_workers=Config.SARVAM_MAX_PARALLEL, thread_name_prefix="sarvam")
 
-    def stop_listening(self):
-        """Stop recording."""
-        self.is_listening = False
-        self.stop_event.set()
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
+    def _encode_wav(self, samples: np.ndarray) -> bytes:
+        """Wrap int16 PCM samples in a WAV header without touching the disk."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wf:
+            wf.setnchannels(self.CHANNELS)
+            wf.setsampwidth(2)
+            wf.setframerate(self.RATE)
+            wf.writeframes(samples.tobytes())
+        return buffer.getvalue()
 
-    def listen_once(self) -> str:
+    def split_at_pauses(self, samples: np.ndarray):
         """
-        Record until silence is detected, then transcribe.
-        Returns transcribed text.
+        Split samples into segments of at most SARVAM_SEGMENT_SECONDS.
+        Each cut is placed at the quietest point of the second half of the
+        segment, so it falls in a pause rather than inside a word.
         """
-        if not self.client:
-            return "Error: Sarvam Client not initialized"
-
-        frames = []
-        silent_chunks = 0
-        has_speech = False
-        
-        # Calculate chunks for silence duration
-        silence_chunks_limit = int(self.SILENCE_DURATION * self.RATE / self.CHUNK)
-        
-        print("Listening for speech...")
-        
-        while self.is_listening:
+        max_len = int(Config.SARVAM_SEGMENT_SECONDS * self.RATE)
+        if len(samples) <= max_len:
+            return [samples]
+
+        frame = self.vad.frame_size
+        rms, _ = self.vad.frame_features(samples)
+        # Energy averaged over ~200 ms, so a short gap between syllables is not a pause
+        width = max(1, int(0.2 / self.vad.frame_duration))
+        smoothed = np.convolve(rms, np.ones(width) / width, mode="same")
+
+        segments = []
+        start = 0
+        while len(samples) - start > max_len:
+            lo = (start + max_len // 2) // frame
+            hi = (start + max_len) // frame
+            cut = (lo + int(np.argmin(smoothed[lo:hi]))) * frame
+            segments.append(samples[start:cut])
+            start = cut
+        segments.append(samples[start:])
+        return segments
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        """Network errors, 429 and 5xx are worth a retry; other 4xx would fail the same way."""
+        status = getattr(error, "status_code", None)
+        return status is None or status == 429 or status >= 500
+
+    def _transcribe_segment(self, samples: np.ndarray):
+        """Transcript of one segment ("" if silent), or None if the upload failed (after one retry)."""
+        audio = self._encode_wav(samples)
+        for attempt in range(2):
             try:
-                data = self.stream.read(self.CHUNK, exception_on_overflow=False)
-                frames.append(data)
-                
-                # Simple amplitude check
-                import audioop
-                rms = audioop.rms(data, 2)
-                
-                if rms > self.SILENCE_THRESHOLD:
-                    silent_chunks = 0
-                    has_speech = True
-                else:
-                    silent_chunks += 1
-                
-                # If we have speech and then enough silence, stop
-                if has_speech and silent_chunks > silence_chunks_limit:
-                    print("Silence detected, processing...")
-                    break
-                    
-                # Timeout if too long
-                if len(frames) * self.CHUNK / self.RATE > self.MAX_DURATION:
-                    print("Max duration reached, processing...")
-                    break
-                    
-            except Exception as e:
-                print(f"Recording error: {e}")
-                break
-                
-        if not frames or not has_speech:
-            return ""
-            
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as f:
-            wf = wave.open(f.name, 'wb')
-            wf.setnchannels(self.CHANNELS)
-            wf.setsampwidth(self.audio.get_sample_size(self.FORMAT))
-            wf.setframerate(self.RATE)
-            wf.writeframes(b''.join(frames))
-            wf.close()
-            temp_filename = f.name
-            
-        # Transcribe
-        # Transcribe
-        try:
-            print("Transcribing with Sarvam...")
-            if not os.path.exists(temp_filename):
-                print("Error: Audio file not found")
-                return ""
-                
-            # Pass open file object to SDK
-            with open(temp_filename, "rb") as audio_file:
                 response = self.client.speech_to_text.transcribe(
-                    file=audio_file,
-                    model="saarika:v2.5", 
-                    language_code="en-IN" 
+                    file=("answer.wav", audio, "audio/wav"),
+                    model="saarika:v2.5",
+                    language_code="en-IN"
                 )
-            
-            transcript = response.transcript
-            # print(f"📝 You said: {transcript}") # Main loop prints this
-            return transcript
-            
-        except Exception as e:
-            print(f"Sarvam Transcription Error: {e}")
+                return response.transcript or ""
+            except Exception as e:
+                retry = attempt == 0 and self._retryable(e)
+                print(f"Sarvam Transcription Error{' (retrying)' if retry else ''}: {e}")
+                if not retry:
+                    break
+                # Jittered, so parallel segments hitting a rate limit don't retry in lockstep
+                time.sleep(random.uniform(RETRY_DELAY / 2, RETRY_DELAY))
+        return None
+
+    def transcribe(self, samples: np.ndarray, prompt: str = None) -> str:
+        """Upload int16 PCM samples to Sarvam and return the transcript."""
+        if not self.client:
+            print("Sarvam Transcription Error: client not initialized")
             return ""
-        finally:
-            try:
-                os.remove(temp_filename)
-            except:
-                pass
+
+        segments = self.split_at_pauses(samples)
+        if len(segments) == 1:
+            return self._transcribe_segment(samples) or ""
+
+        start = time.perf_counter()
+        # map() keeps the segments in order whichever upload finishes first
+        texts = list(self.executor.map(self._transcribe_segment, segments))
+        print(f"[OK] Sarvam: {len(segments)} segments of {len(samples) / self.RATE:.1f}s "
+              f"transcribed in parallel in {time.perf_counter() - start:.2f}s")
+
+        lost = [i + 1 for i, text in enumerate(texts) if text is None]
+        if len(lost) == len(segments):
+            return ""
+        if lost:
+            print(f"[WARN] Sarvam: segment(s) {lost} of {len(segments)} could not be transcribed")
+        # Mark the gap so the interviewer knows part of the answer is missing
+        texts = [INAUDIBLE if text is None else text.strip() for text in texts]
+        return " ".join(text for text in texts if text)
 
     def close(self):
-        self.stop_listening()
-        self.audio.terminate()
+        super().close()
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        if self.http:
+            self.http.close()
@@ -0,0 +1,95 @@
+"""Append-only JSONL journal of an interview session, used to resume after a crash."""
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from .config import Config
+
+
+class SessionJournal:
+    """
+    Record every turn of a session as one JSON line.
+
+    Each append is a single buffered write plus a flush to the OS, which
+    survives a crash or Ctrl+C of the process. fsync (needed to survive a
+    power loss) is batched: it runs every fsync_every records and on close.
+
+    Record types:
+        {"type": "start", "session", "role", "ts"}
+        {"type": "message", "role": "user" | "assistant", "text", "ts"}
+        {"type": "answer", "index", "question", "answer", "ts"}  (one per evaluated answer)
+        {"type": "evaluation", "index", "result", "ts"}
+        {"type": "interrupted", "text", "ts"}  (replaces the last reply after a barge-in)
+        {"type": "end", "ts"}
+    """
+
+    def __init__(self, session_id: str = None, journal_dir=Config.JOURNAL_DIR,
+                 fsync_every=Config.JOURNAL_FSYNC_EVERY):
+        self.session_id = session_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.fsync_every = fsync_every
+        self.unsynced = 0
+        self.lock = threading.Lock()
+        os.makedirs(journal_dir, exist_ok=True)
+        self.path = self.path_for(self.session_id, journal_dir)
+        resuming = os.path.exists(self.path)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if resuming and self._ends_mid_line():
+            # Terminate a line cut short by a crash so new records stay parseable
+            self.file.write("\n")
+        if not resuming:
+            self.append({"type": "start", "session": self.session_id, "role": Config.ROLE})
+
+    @staticmethod
+    def path_for(session_id: str, journal_dir=Config.JOURNAL_DIR) -> str:
+        return os.path.join(journal_dir, f"{session_id}.jsonl")
+
+    @classmethod
+    def load(cls, session_id: str, journal_dir=Config.JOURNAL_DIR):
+        """Read a session's records; a line cut short by a crash is ignored."""
+        path = cls.path_for(session_id, journal_dir)
+        if not os.path.exists(path):
+            raise ValueError(f"No journal for session '{session_id}' ({path})")
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    print(f"[WARN] Skipping incomplete journal line in {path}")
+        return records
+
+    def _ends_mid_line(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def append(self, record: dict):
+        """Write one record (thread-safe)."""
+        line = json.dumps({**record, "ts": round(time.time(), 3)}) + "\n"
+        with self.lock:
+            if not self.file:
+                return
+            self.file.write(line)
+            self.file.flush()
+            self.unsynced += 1
+            if self.fsync_every and self.unsynced >= self.fsync_every:
+                os.fsync(self.file.fileno())
+                self.unsynced = 0
+
+    def message(self, role: str, text: str):
+        self.append({"type": "message", "role": role, "text": text})
+
+    def close(self, finished=False):
+        """Sync and close; finished marks the interview as completed."""
+        if finished:
+            self.append({"type": "end"})
+        with self.lock:
+            if self.file:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
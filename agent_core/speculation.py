@@ -0,0 +1,87 @@
+"""Speculative Bedrock replies started on a provisional transcript."""
+import re
+import queue
+import threading
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def normalize_transcript(text: str) -> str:
+    """Compare transcripts ignoring case, punctuation and spacing."""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+class SpeculativeReply:
+    """
+    Generate a reply on a background thread before the answer is final.
+
+    Sentences are buffered as they stream in. If the final transcript
+    matches, the caller consumes them with sentences() (waiting for any
+    still being generated); otherwise cancel() stops the stream.
+    """
+
+    def __init__(self, answer: str, stream, input_tokens: int):
+        """
+        Args:
+            answer: provisional transcript the reply is based on
+            stream: callable returning an iterator of reply sentences
+            input_tokens: estimated prompt size (for wasted-token accounting)
+        """
+        self.answer = answer
+        self.key = normalize_transcript(answer)
+        self.input_tokens = input_tokens
+        self.parts = []
+        self.error = None
+        self.buffer = queue.Queue()
+        self.cancelled = threading.Event()
+        self.finished = False
+        self.finish_callbacks = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, args=(stream,), daemon=True)
+        self.thread.start()
+
+    def matches(self, answer: str) -> bool:
+        return self.key == normalize_transcript(answer)
+
+    def _run(self, stream):
+        sentences = stream()
+        try:
+            for sentence in sentences:
+                if self.cancelled.is_set():
+                    break
+                self.parts.append(sentence)
+                self.buffer.put(sentence)
+        except Exception as e:
+            self.error = e
+        finally:
+            # Closing the generator also closes the Bedrock event stream
+            sentences.close()
+            self.buffer.put(None)
+            with self.lock:
+                self.finished = True
+                callbacks, self.finish_callbacks = self.finish_callbacks, []
+            for callback in callbacks:
+                callback(self)
+
+    def when_finished(self, callback):
+        """Run callback(self) once the stream has stopped (now, if it already has)."""
+        with self.lock:
+            if not self.finished:
+                self.finish_callbacks.append(callback)
+                return
+        callback(self)
+
+    def sentences(self):
+        """Yield the reply sentences, including those still being generated."""
+        while True:
+            sentence = self.buffer.get()
+            if sentence is None:
+                return
+            yield sentence
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.parts)
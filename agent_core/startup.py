@@ -0,0 +1,42 @@
+"""Concurrent startup of the interview components."""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class StartupOrchestrator:
+    """
+    Run startup steps (model loading, AWS clients, audio devices, the first
+    question) on threads at the same time and record how long each took.
+    Steps that depend on another step call .result() on its future, so
+    their timing includes the wait for that dependency.
+    """
+
+    def __init__(self, max_workers=6):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.timings = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def submit(self, name: str, fn, *args, **kwargs):
+        """Start a named step; returns a Future for its result."""
+        def timed():
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.timings[name] = time.perf_counter() - start
+        return self.executor.submit(timed)
+
+    def report(self):
+        """Print per-step timings next to the wall-clock total."""
+        wall = time.perf_counter() - self.started
+        with self.lock:
+            timings = dict(self.timings)
+        print("\n⏱️  Startup timings:")
+        for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+            print(f"   {name:<16} {seconds:6.2f}s")
+        print(f"   {'total (wall)':<16} {wall:6.2f}s")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
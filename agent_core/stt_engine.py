@@ -0,0 +1,260 @@
+"""Common interface and registry for speech-to-text engines."""
+import time
+import queue
+import importlib
+import threading
+import numpy as np
+from .config import Config
+from .vad import VoiceActivityDetector
+from .audio_capture import AudioCapture, create_pyaudio
+from .metrics import NULL_METRICS
+
+# Engine name -> "module:class", imported lazily so optional SDKs are only
+# needed for the engine actually selected
+STT_ENGINES = {
+    "whisper": "agent_core.whisper_handler:WhisperHandler",
+    "faster-whisper": "agent_core.faster_whisper_handler:FasterWhisperHandler",
+    "sarvam": "agent_core.sarvam_handler:SarvamHandler",
+}
+
+
+def create_stt_engine(name=None, **kwargs):
+    """Instantiate and load the STT engine selected by name (default: Config.STT_ENGINE)."""
+    name = name or Config.STT_ENGINE
+    if name not in STT_ENGINES:
+        raise ValueError(f"Unknown STT engine '{name}' (choose from: {', '.join(STT_ENGINES)})")
+    module_name, class_name = STT_ENGINES[name].split(":")
+    engine_class = getattr(importlib.import_module(module_name), class_name)
+    engine = engine_class(**kwargs)
+    engine.load()
+    return engine
+
+
+def pcm_to_float(samples: np.ndarray) -> np.ndarray:
+    """Convert 16 kHz int16 PCM samples to a float32 [-1, 1] array."""
+    audio = samples.astype(np.float32)
+    audio *= 1.0 / 32768.0  # Scale in place to avoid a second copy
+    return audio
+
+
+class STTEngine:
+    """
+    Base class for speech-to-text engines.
+
+    Microphone capture, voice activity detection and end-of-turn handling
+    live here so every engine behaves the same. Engines implement load()
+    and transcribe(); transcribe_stream() can be overridden by engines with
+    a native streaming API.
+    """
+
+    name = "stt"
+
+    def __init__(self, capture=True):
+        """
+        Args:
+            capture: set up the local microphone (False when audio arrives
+                     from elsewhere and only transcribe() is used)
+        """
+        # Audio setup
+        self.audio = create_pyaudio() if capture else None
+        self.is_listening = False
+        self.metrics = NULL_METRICS  # Replaced by a MetricsRecorder when metrics are enabled
+        self.end_of_speech_at = None  # perf_counter() when the last answer was end-pointed
+
+        # Audio config
+        self.CHUNK = 1024
+        self.CHANNELS = 1
+        self.RATE = 16000
+        self.SILENCE_DURATION = Config.SILENCE_DURATION  # Seconds of silence that end the answer
+        self.MAX_DURATION = 60.0  # Maximum recording duration in seconds
+        self.PREROLL = Config.CAPTURE_PREROLL_MS / 1000  # Audio kept from before listen_once starts
+        self.vad = VoiceActivityDetector(self.RATE)
+        self.capture = AudioCapture(self.audio, self.RATE, self.CHUNK) if capture else None
+
+        # Rolling transcription config
+        self.ROLLING_TRANSCRIPTION = True  # Transcribe in the background while the candidate speaks
+        self.PAUSE_DURATION = 0.6  # Seconds of silence that mark a stable segment boundary
+        self.MAX_SEGMENT_DURATION = 25.0  # Force a commit before Whisper's 30 s window
+
+    def load(self):
+        """Load models or create clients. Called once by create_stt_engine()."""
+
+    def transcribe(self, samples: np.ndarray, prompt: str = None) -> str:
+        """
+        Transcribe 16 kHz mono int16 samples, optionally conditioned on the
+        preceding text. Returns "" on failure.
+        """
+        raise NotImplementedError
+
+    def enable_batching(self) -> bool:
+        """
+        Batch transcribe() calls arriving from several threads at once.
+        Returns True if supported; transcribe() is then safe to call concurrently.
+        """
+        return False
+
+    def transcribe_stream(self, segments):
+        """
+        Transcribe consecutive PCM segments of one utterance, yielding the
+        transcript so far after each segment.
+        """
+        text = ""
+        for samples in segments:
+            # Condition on the tail of the transcript so segment joins stay coherent
+            part = self.transcribe(samples, prompt=text[-200:] or None)
+            if part:
+                text = f"{text} {part}" if text else part
+                yield text
+
+    def start_listening(self):
+        """Start recording audio."""
+        self.is_listening = True
+        self.capture.start()
+        print(f"🎤 Listening... ({self.name})")
+
+    def stop_listening(self):
+        """Stop recording."""
+        self.is_listening = False
+        if self.capture:
+            self.capture.stop()
+
+    def listen_once(self, on_partial=None, on_speech_resumed=None, start_pos=None) -> str:
+        """
+        Record until silence is detected, then transcribe.
+        Args:
+            on_partial: optional callback receiving the transcript so far
+                        each time a segment finishes before end of turn (rolling mode only)
+            on_speech_resumed: optional callback run when speech starts again
+                        after a pause was committed (rolling mode only)
+            start_pos: capture position to start from, e.g. where the candidate
+                        barged in on the last reply (default: now minus the preroll)
+        Returns transcribed text ("" if nothing was understood).
+        """
+        if start_pos is None:
+            # Start slightly in the past so speech that began between turns is kept
+            start_pos = self.capture.position - int(self.PREROLL * self.RATE)
+        start = max(start_pos, self.capture.oldest_position)
+        pos = start
+        rolling = RollingTranscriber(self, start, on_partial) if self.ROLLING_TRANSCRIPTION else None
+        self.vad.reset()
+
+        print("Listening for speech...")
+
+        while self.is_listening:
+            try:
+                samples = self.capture.read(pos, self.CHUNK)
+                if samples is None:
+                    continue
+                pos += len(samples)
+                is_speech = self.vad.process(samples)
+
+                if rolling:
+                    # First speech after a committed pause: any partial transcript is now stale
+                    if on_speech_resumed and is_speech and not rolling.pending_has_speech \
+                            and rolling.segment_start > start:
+                        on_speech_resumed()
+                    rolling.feed(pos, is_speech)
+                    # A short pause is a stable boundary: transcribe what we have so far
+                    if rolling.pending_has_speech and self.vad.trailing_silence >= self.PAUSE_DURATION:
+                        rolling.commit()
+                    elif rolling.pending_duration >= self.MAX_SEGMENT_DURATION:
+                        rolling.commit()
+
+                # If we have speech and then enough silence, stop
+                if self.vad.has_speech and self.vad.trailing_silence >= self.SILENCE_DURATION:
+                    print("Silence detected, processing...")
+                    break
+
+                # Timeout if too long
+                if (pos - start) / self.RATE > self.MAX_DURATION:
+                    print("Max duration reached, processing...")
+                    break
+
+            except Exception as e:
+                print(f"Recording error: {e}")
+                break
+
+        if pos == start or not self.vad.has_speech:
+            if rolling:
+                rolling.finish(decode_tail=False)
+            return ""
+
+        # Silence the VAD waited through after the last word
+        self.end_of_speech_at = time.perf_counter()
+        self.metrics.record("vad_endpoint", self.vad.trailing_silence)
+
+        with self.metrics.span("stt", engine=self.name, audio_s=round((pos - start) / self.RATE, 2)):
+            if rolling:
+                # Earlier segments were decoded while the candidate was talking
+                print(f"Transcribing remaining audio with {self.name}...")
+                return rolling.finish()
+
+            print(f"Transcribing with {self.name}...")
+            return self.transcribe(self.capture.slice(start, pos))
+
+    def close(self):
+        self.stop_listening()
+        if self.audio:
+            self.audio.terminate()
+
+
+class RollingTranscriber:
+    """
+    Incrementally transcribe one utterance while it is still being recorded.
+    Audio is committed at stable boundaries (pauses) and fed to the engine's
+    transcribe_stream() on a background thread, so at end of turn only the
+    uncommitted tail is left.
+    """
+
+    def __init__(self, engine, start_pos: int, on_partial=None):
+        self.engine = engine
+        self.on_partial = on_partial
+        self.text = ""
+        self.segment_start = start_pos
+        self.segment_end = start_pos
+        self.pending_has_speech = False
+        self.finishing = False  # End of turn reached: the final text is not a partial
+        self.segment_queue = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    @property
+    def pending_duration(self) -> float:
+        """Seconds of audio recorded since the last commit."""
+        return (self.segment_end - self.segment_start) / self.engine.RATE
+
+    def feed(self, end_pos: int, is_speech: bool):
+        """Extend the uncommitted audio up to end_pos in the capture buffer."""
+        self.segment_end = end_pos
+        self.pending_has_speech = self.pending_has_speech or is_speech
+
+    def commit(self):
+        """Hand the audio recorded so far to the background decoder."""
+        if self.pending_has_speech:
+            self.segment_queue.put((self.segment_start, self.segment_end))
+        self.segment_start = self.segment_end
+        self.pending_has_speech = False
+
+    def _segments(self):
+        while True:
+            segment = self.segment_queue.get()
+            if segment is None:
+                return
+            yield self.engine.capture.slice(*segment)
+
+    def _run(self):
+        for text in self.engine.transcribe_stream(self._segments()):
+            self.text = text
+            if self.on_partial and not self.finishing:
+                self.on_partial(text)
+
+    def finish(self, decode_tail=True) -> str:
+        """Decode the remaining tail, wait for the decoder and return the full transcript."""
+        # Set before the tail is committed so the end-of-turn transcript is not
+        # reported as a mid-answer partial (it would start a pointless speculation)
+        self.finishing = True
+        if decode_tail:
+            self.commit()
+        self.segment_queue.put(None)
+        self.worker.join()
+        return self.text
@@ -0,0 +1,140 @@
+"""Content-addressed cache for synthesized speech."""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from .config import Config
+
+class TTSCache:
+    """
+    Two-tier cache of synthesized audio keyed by text, voice, engine and format.
+
+    Tier 1 is an in-memory LRU bounded by a byte budget. Tier 2 is an on-disk
+    store (one file per key) bounded by its own byte budget, evicting the
+    least recently used files. Disk hits are promoted back into memory.
+    """
+
+    def __init__(self, cache_dir=Config.TTS_CACHE_DIR,
+                 memory_bytes=Config.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+                 disk_bytes=Config.TTS_CACHE_DISK_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_budget = memory_bytes
+        self.disk_budget = disk_bytes
+
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "disk_evictions": 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.disk_size = sum(size for _, size, _ in self._disk_entries())
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, engine: str, output_format: str) -> str:
+        """Hash everything that affects the synthesized audio."""
+        raw = "\x1f".join((voice_id, engine, output_format, text))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        # Shard by prefix so a single directory never holds too many files
+        return os.path.join(self.cache_dir, key[:2], key + ".bin")
+
+    def get(self, key: str):
+        """Return cached audio bytes, or None on a miss."""
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return data
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Refresh recency for disk eviction
+        except OSError:
+            with self.lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self.lock:
+            self.stats["disk_hits"] += 1
+            self._memory_put(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store audio bytes in both tiers."""
+        if not data:
+            return
+        with self.lock:
+            self._memory_put(key, data)
+
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # Atomic, so readers never see partial files
+        except OSError as e:
+            print(f"TTS Cache Error: {e}")
+            return
+
+        with self.lock:
+            self.disk_size += len(data)
+            over_budget = self.disk_size > self.disk_budget
+        if over_budget:
+            self._evict_disk()
+
+    def _memory_put(self, key: str, data: bytes):
+        if len(data) > self.memory_budget:
+            return
+        if key in self.memory:
+            self.memory_size -= len(self.memory.pop(key))
+        self.memory[key] = data
+        self.memory_size += len(data)
+        while self.memory_size > self.memory_budget:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_size -= len(evicted)
+
+    def _disk_entries(self):
+        """Yield (path, size, mtime) for every cached file."""
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".bin"):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict_disk(self):
+        """Delete least recently used files until the store is at 90% of its budget."""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.disk_budget * 0.9
+        evicted = 0
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+                evicted += 1
+            except OSError:
+                pass
+        with self.lock:
+            self.disk_size = size
+            self.stats["disk_evictions"] += evicted
+
+    def summary(self) -> str:
+        """One-line hit/miss report for sizing the cache."""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        rate = hits / total * 100 if total else 0.0
+        return (f"{hits}/{total} hits ({rate:.0f}%) - memory {self.stats['memory_hits']}, "
+                f"disk {self.stats['disk_hits']}, misses {self.stats['misses']}, "
+                f"disk evictions {self.stats['disk_evictions']}, "
+                f"{self.memory_size / 1024:.0f} KB in memory, {self.disk_size / 1024:.0f} KB on disk")
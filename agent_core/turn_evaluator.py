@@ -0,0 +1,112 @@
+"""Background per-turn answer evaluation, merged into the final report."""
+import re
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from .config import Config
+
+JSON_OBJECT = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def parse_evaluation(text: str) -> dict:
+    """Pull the JSON object out of a model reply (None if there is none)."""
+    match = JSON_OBJECT.search(text or "")
+    if not match:
+        return None
+    try:
+        result = json.loads(match.group(0))
+        result["score"] = max(1, min(10, int(result.get("score", 0))))
+        return result
+    except (ValueError, TypeError):
+        return None
+
+
+class TurnEvaluator:
+    """
+    Score each answer on a background thread as soon as it is given.
+
+    Every call is small (one question and one answer), so evaluations run
+    alongside the next question and the end-of-interview report only merges
+    results that are already available.
+    """
+
+    def __init__(self, evaluate, on_result=None, max_workers=2):
+        """
+        Args:
+            evaluate: callable(question, answer) -> model reply text or None
+            on_result: optional callable(index, result) run when a score is ready
+        """
+        self.evaluate = evaluate
+        self.on_result = on_result
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="evaluate")
+        self.turns = []  # [question, answer, evaluation or None] in interview order
+        self.futures = []
+        self.lock = threading.Lock()
+
+    def submit(self, question: str, answer: str) -> int:
+        """Queue one question/answer turn for evaluation; returns its index."""
+        with self.lock:
+            index = len(self.turns)
+            self.turns.append([question, answer, None])
+        self.futures.append(self.executor.submit(self._run, index, question, answer))
+        return index
+
+    def _run(self, index: int, question: str, answer: str):
+        result = parse_evaluation(self.evaluate(question, answer))
+        with self.lock:
+            self.turns[index][2] = result
+        if self.on_result:
+            self.on_result(index, result)
+
+    def restore(self, question: str, answer: str, result: dict = None):
+        """Add a turn from a previous run; it is only re-scored if it has no result."""
+        if result is None:
+            self.submit(question, answer)
+            return
+        with self.lock:
+            self.turns.append([question, answer, result])
+
+    def results(self, timeout=Config.EVALUATION_WAIT_TIMEOUT):
+        """Wait for outstanding evaluations (bounded) and return the turns."""
+        wait(self.futures, timeout=timeout)
+        with self.lock:
+            return [list(turn) for turn in self.turns]
+
+    def merge(self) -> str:
+        """Combine per-turn evaluations into the report's evaluation section."""
+        turns = self.results()
+        scored = [turn for turn in turns if turn[2]]
+        if not scored:
+            return "No answers could be evaluated."
+
+        average = sum(turn[2]["score"] for turn in scored) / len(scored)
+        if average >= 7:
+            recommendation = "Hire"
+        elif average >= 5:
+            recommendation = "Further Review"
+        else:
+            recommendation = "Not Hire"
+
+        lines = [f"1. Overall Performance Rating: {average:.1f}/10 (average of {len(scored)} answers)", "",
+                 "2. Per-question results:"]
+        for number, (question, answer, evaluation) in enumerate(turns, 1):
+            if evaluation:
+                lines.append(f"   Q{number} [{evaluation.get('topic', '?')}] "
+                             f"{evaluation['score']}/10 - {evaluation.get('verdict', '?')}")
+            else:
+                lines.append(f"   Q{number} - not evaluated")
+
+        strengths = [turn[2].get("strength") for turn in scored if turn[2].get("strength")]
+        gaps = [turn[2].get("gap") for turn in scored if turn[2].get("gap")]
+        good = [turn[2].get("topic") for turn in scored if turn[2]["score"] >= 7 and turn[2].get("topic")]
+        weak = [turn[2].get("topic") for turn in scored if turn[2]["score"] < 5 and turn[2].get("topic")]
+
+        lines += ["", "3. Strengths:"] + [f"   - {s}" for s in strengths or ["None noted"]]
+        lines += ["", "4. Weaknesses / knowledge gaps:"] + [f"   - {g}" for g in gaps or ["None noted"]]
+        lines += ["", f"5. Topics understood well: {', '.join(good) or 'None'}"]
+        lines += [f"6. Topics that need improvement: {', '.join(weak) or 'None'}"]
+        lines += ["", f"7. Final recommendation: {recommendation}"]
+        return "\n".join(lines)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
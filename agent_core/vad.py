@@ -0,0 +1,118 @@
+"""Voice activity detection shared by the speech-to-text handlers."""
+import numpy as np
+from .config import Config
+
+class VoiceActivityDetector:
+    """
+    Frame-wise energy + zero-crossing voice activity detector.
+
+    Each chunk is split into short frames and analysed with NumPy. A frame
+    counts as speech when its energy is well above an adaptive noise floor
+    and its zero-crossing rate is not that of broadband noise. Onset and
+    hangover smoothing stop clicks from triggering and short gaps between
+    words from ending the utterance.
+    """
+
+    def __init__(self, sample_rate=Config.SAMPLE_RATE, frame_ms=20):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.frame_duration = self.frame_size / sample_rate
+
+        # Detection config
+        self.snr_ratio = 10 ** (Config.VAD_SNR_DB / 20)  # Required energy over the noise floor
+        self.min_rms = Config.VAD_MIN_RMS  # Absolute floor so digital silence never triggers
+        self.max_zcr = 0.35  # Noise-like frames cross zero far more often than voiced speech
+        self.onset_frames = 3  # Consecutive speech frames needed to start speech
+        self.hangover_frames = int(Config.VAD_HANGOVER_MS / frame_ms)
+
+        # Noise floor adaptation rates (fast down, slow up, very slow during speech)
+        self.floor_attack = 0.3
+        self.floor_release = 0.05
+        self.floor_speech = 0.001
+
+        self.noise_floor = None
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self.reset()
+
+    def reset(self):
+        """Reset per-utterance state (the learned noise floor is kept)."""
+        self.in_speech = False
+        self.has_speech = False
+        self.speech_run = 0
+        self.hangover = 0
+        self.silence_frames = 0
+        self.speech_frames = 0
+        self._remainder = np.zeros(0, dtype=np.int16)
+
+    @property
+    def trailing_silence(self) -> float:
+        """Seconds of non-speech since speech last ended."""
+        return self.silence_frames * self.frame_duration
+
+    @property
+    def speech_duration(self) -> float:
+        """Seconds of speech seen since the last reset."""
+        return self.speech_frames * self.frame_duration
+
+    def frame_features(self, samples: np.ndarray):
+        """Return per-frame RMS energy and zero-crossing rate for int16 samples."""
+        n_frames = len(samples) // self.frame_size
+        frames = samples[:n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        frames = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_size - 1)
+        return rms, zcr
+
+    def process(self, samples: np.ndarray) -> bool:
+        """
+        Feed a chunk of int16 samples.
+        Returns True if any part of the chunk is (smoothed) speech.
+        """
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+        n_used = (len(samples) // self.frame_size) * self.frame_size
+        self._remainder = samples[n_used:].copy()
+        if not n_used:
+            return self.in_speech
+
+        rms, zcr = self.frame_features(samples[:n_used])
+        if self.noise_floor is None:
+            self.noise_floor = max(float(np.min(rms)), 1.0)
+
+        # Vectorized candidate decision against the floor at chunk start
+        threshold = max(self.noise_floor * self.snr_ratio, self.min_rms)
+        loud = rms > threshold
+        candidates = loud & ((zcr < self.max_zcr) | (rms > 2 * threshold))
+
+        chunk_has_speech = False
+        for energy, is_candidate in zip(rms.tolist(), candidates.tolist()):
+            if is_candidate:
+                self.speech_run += 1
+                if self.speech_run >= self.onset_frames:
+                    self.in_speech = True
+                    self.has_speech = True
+                    self.hangover = self.hangover_frames
+            else:
+                self.speech_run = 0
+                if self.hangover > 0:
+                    self.hangover -= 1
+                else:
+                    self.in_speech = False
+
+            if self.in_speech:
+                chunk_has_speech = True
+                self.speech_frames += 1
+                self.silence_frames = 0
+                rate = self.floor_speech
+            else:
+                self.silence_frames += 1
+                if is_candidate:
+                    rate = 0.0  # Possible onset: don't let it raise the floor
+                elif energy < self.noise_floor:
+                    rate = self.floor_attack
+                else:
+                    rate = self.floor_release
+            self.noise_floor = max(self.noise_floor + rate * (energy - self.noise_floor), 1.0)
+
+        return chunk_has_speech
@@ -0,0 +1,143 @@
+"""Micro-batching Whisper inference for concurrent utterances."""
+import time
+import queue
+import threading
+import numpy as np
+import torch
+import whisper
+from whisper.audio import N_FFT, HOP_LENGTH, N_SAMPLES, mel_filters
+from concurrent.futures import Future
+from .config import Config
+from .stt_engine import pcm_to_float
+
+# Same thresholds model.transcribe() uses to drop silent windows
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+
+def batch_log_mel(audios, n_mels: int, device) -> torch.Tensor:
+    """
+    Log-mel spectrograms for a batch of float32 clips (each padded or trimmed
+    to Whisper's 30 s window) in one STFT. Matches whisper.log_mel_spectrogram
+    per clip, including its per-clip dynamic range clamp.
+    """
+    batch = torch.stack([whisper.pad_or_trim(torch.from_numpy(audio)) for audio in audios]).to(device)
+    window = torch.hann_window(N_FFT).to(device)
+    stft = torch.stft(batch, N_FFT, HOP_LENGTH, window=window, return_complex=True)
+    magnitudes = stft[..., :-1].abs() ** 2
+    log_spec = torch.clamp(mel_filters(device, n_mels) @ magnitudes, min=1e-10).log10()
+    peak = log_spec.amax(dim=(1, 2), keepdim=True)
+    log_spec = torch.maximum(log_spec, peak - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+
+class WhisperBatcher:
+    """
+    Collect utterances submitted from many threads and decode them together.
+
+    A worker thread waits for the first request, keeps collecting for
+    window_ms (or until max_batch requests are pending), then runs one
+    batched encoder/decoder pass and resolves each caller's Future. The
+    worker is the only thread touching the model.
+    """
+
+    def __init__(self, model, device: str, window_ms=Config.WHISPER_BATCH_WINDOW_MS,
+                 max_batch=Config.WHISPER_BATCH_MAX_SIZE):
+        self.model = model
+        self.device = device
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.stats = {"batches": 0, "utterances": 0, "busy_seconds": 0.0}
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, samples: np.ndarray, prompt: str = None) -> Future:
+        """Queue int16 PCM for transcription; the Future resolves to the transcript."""
+        future = Future()
+        self.requests.put((pcm_to_float(samples), prompt, future))
+        return future
+
+    def _collect(self):
+        """Block for one request, then gather more until the window closes."""
+        batch = [self.requests.get()]
+        if batch[0] is None:
+            return None
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self.requests.put(None)  # Finish this batch, then stop
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            # A decoding prompt applies to the whole batch, so group by prompt
+            groups = {}
+            for request in batch:
+                groups.setdefault(request[1], []).append(request)
+            for prompt, requests in groups.items():
+                self._transcribe_group(prompt, requests)
+            with self.lock:
+                self.stats["batches"] += 1
+                self.stats["utterances"] += len(batch)
+                self.stats["busy_seconds"] += time.perf_counter() - start
+
+    def _transcribe_group(self, prompt, requests):
+        short = [r for r in requests if len(r[0]) <= N_SAMPLES]
+        # Longer than one 30 s window: needs model.transcribe's sliding window
+        for audio, _, future in requests:
+            if len(audio) > N_SAMPLES:
+                self._resolve(future, lambda: self.model.transcribe(
+                    audio, language="en", fp16=(self.device == "cuda"), initial_prompt=prompt
+                )["text"].strip())
+        if not short:
+            return
+
+        try:
+            mel = batch_log_mel([r[0] for r in short], self.model.dims.n_mels, self.device)
+            options = whisper.DecodingOptions(
+                language="en", fp16=(self.device == "cuda"), without_timestamps=True, prompt=prompt
+            )
+            results = whisper.decode(self.model, mel, options)
+        except Exception as e:
+            for _, _, future in short:
+                future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(short, results):
+            silent = result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD
+            future.set_result("" if silent else result.text.strip())
+
+    @staticmethod
+    def _resolve(future, fn):
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
+
+    def summary(self) -> str:
+        with self.lock:
+            stats = dict(self.stats)
+        if not stats["batches"]:
+            return "no utterances"
+        return (f"{stats['utterances']} utterances in {stats['batches']} batches "
+                f"(avg {stats['utterances'] / stats['batches']:.1f}), "
+                f"{stats['utterances'] / max(stats['busy_seconds'], 1e-6):.1f} utterances/s while busy")
+
+    def close(self):
+        self.requests.put(None)
+        self.worker.join(timeout=5.0)
@@ -1,130 +1,158 @@
 import os
+import copy
+import time
 import wave
-import tempfile
-import pyaudio
+import numpy as np
 import whisper
 import torch
+from .config import Config
+from .stt_engine import STTEngine, pcm_to_float
 
-class WhisperHandler:
+
+def configure_torch_threads(intra_op=Config.TORCH_THREADS, inter_op=Config.TORCH_INTEROP_THREADS):
+    """Apply torch thread counts from config (0 keeps torch's default)."""
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work has started
+            print("[WARN] torch inter-op threads already initialised, keeping current setting")
+
+
+def quantize_model(model):
+    """
+    Return a copy of a Whisper model with its linear layers dynamically
+    quantized to int8 (CPU only).
+    """
+    model = copy.deepcopy(model)
+    # Whisper uses its own nn.Linear subclass, which quantize_dynamic does not
+    # match, so swap in plain nn.Linear layers carrying the same weights first
+    for module in list(model.modules()):
+        for name, child in module.named_children():
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.load_state_dict(child.state_dict())
+                setattr(module, name, plain)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance between two transcripts, relative to the reference length."""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+class WhisperHandler(STTEngine):
     """Handle Speech-to-Text using local Whisper model."""
     
-    def __init__(self, model_size="small"):
+    name = "Whisper"
+    
+    def __init__(self, model_size=Config.STT_MODEL_SIZE, quantize=Config.WHISPER_QUANTIZE, capture=True):
         """
-        Initialize Whisper model.
+        Initialize Whisper engine (the model is loaded by load()).
         Args:
             model_size: "tiny", "base", "small", "medium", "large"
                        - tiny: fastest, less accurate
                        - base: good balance (recommended)
                        - small: better accuracy
                        - medium/large: best accuracy, slower
+            quantize: use dynamic int8 quantization of linear layers (CPU only)
+            capture: set up the local microphone
         """
-        print(f"Loading Whisper model ({model_size})...")
+        super().__init__(capture)
+        self.model_size = model_size
+        self.quantize = quantize
+        self.model = None
+        self.batcher = None
         
         # Check if CUDA is available
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    def load(self):
+        """Load the Whisper model (optionally int8-quantized)."""
+        print(f"Loading Whisper model ({self.model_size})...")
         print(f"Using device: {self.device}")
+        configure_torch_threads()
         
         # Load Whisper model
-        self.model = whisper.load_model(model_size, device=self.device)
-        print(f"[OK] Whisper {model_size} loaded on {self.device}")
+        self.model = whisper.load_model(self.model_size, device=self.device)
+        print(f"[OK] Whisper {self.model_size} loaded on {self.device}")
         
-        # Audio setup
-        self.audio = pyaudio.PyAudio()
-        self.stream = None
-        self.is_listening = False
-        
-        # Audio config
-        self.CHUNK = 1024
-        self.FORMAT = pyaudio.paInt16
-        self.CHANNELS = 1
-        self.RATE = 16000
-        self.SILENCE_THRESHOLD = 500
-        self.SILENCE_DURATION = 4.0
-        self.MAX_DURATION = 60.0
-
-    def start_listening(self):
-        """Start recording audio."""
-        self.is_listening = True
-        self.stream = self.audio.open(
-            format=self.FORMAT,
-            channels=self.CHANNELS,
-            rate=self.RATE,
-            input=True,
-            frames_per_buffer=self.CHUNK
-        )
-        print("🎤 Listening... (Whisper)")
-
-    def stop_listening(self):
-        """Stop recording."""
-        self.is_listening = False
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
+        if self.quantize and self.device == "cpu":
+            quantized = quantize_model(self.model)
+            if self._self_check(self.model, quantized):
+                self.model = quantized
+                print(f"[OK] Whisper {self.model_size} quantized to int8")
 
-    def listen_once(self) -> str:
+    def _self_check(self, reference_model, quantized_model) -> bool:
         """
-        Record until silence is detected, then transcribe.
-        Returns transcribed text.
+        Compare int8 and fp32 models on the bundled audio fixture.
+        Returns False if the quantized transcript drifts too far from fp32,
+        or if fp32 hears nothing in the fixture (nothing to compare against).
         """
-        frames = []
-        silent_chunks = 0
-        has_speech = False
+        fixture = Config.WHISPER_SELFCHECK_AUDIO
+        if not os.path.exists(fixture):
+            # Never adopt int8 unchecked
+            print(f"[WARN] Whisper self-check fixture not found ({fixture}), keeping fp32 model")
+            return False
         
-        silence_chunks_limit = int(self.SILENCE_DURATION * self.RATE / self.CHUNK)
+        with wave.open(fixture, 'rb') as wf:
+            if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                print(f"[WARN] Whisper self-check fixture {fixture} must be 16 kHz mono 16-bit, keeping fp32 model")
+                return False
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        audio = pcm_to_float(samples)
         
-        print("Listening for speech...")
+        results = {}
+        for name, model in (("fp32", reference_model), ("int8", quantized_model)):
+            start = time.perf_counter()
+            text = model.transcribe(audio, language="en", fp16=False)["text"].strip()
+            results[name] = (text, time.perf_counter() - start)
+            if not results["fp32"][0]:
+                # An empty reference would let any int8 output pass with WER 0
+                print(f"[WARN] Whisper self-check: fp32 heard nothing in {fixture}, keeping fp32 model")
+                return False
         
-        while self.is_listening:
-            try:
-                data = self.stream.read(self.CHUNK, exception_on_overflow=False)
-                frames.append(data)
-                
-                # Simple amplitude check
-                import audioop
-                rms = audioop.rms(data, 2)
-                
-                if rms > self.SILENCE_THRESHOLD:
-                    silent_chunks = 0
-                    has_speech = True
-                else:
-                    silent_chunks += 1
-                
-                # If we have speech and then enough silence, stop
-                if has_speech and silent_chunks > silence_chunks_limit:
-                    print("Silence detected, processing...")
-                    break
-                    
-                # Timeout if too long
-                if len(frames) * self.CHUNK / self.RATE > self.MAX_DURATION:
-                    print("Max duration reached, processing...")
-                    break
-                    
-            except Exception as e:
-                print(f"Recording error: {e}")
-                break
-                
-        if not frames or not has_speech:
-            return ""
-            
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as f:
-            wf = wave.open(f.name, 'wb')
-            wf.setnchannels(self.CHANNELS)
-            wf.setsampwidth(self.audio.get_sample_size(self.FORMAT))
-            wf.setframerate(self.RATE)
-            wf.writeframes(b''.join(frames))
-            wf.close()
-            temp_filename = f.name
-            
-        # Transcribe with Whisper
+        wer = word_error_rate(results["fp32"][0], results["int8"][0])
+        fp32_time, int8_time = results["fp32"][1], results["int8"][1]
+        print(f"[OK] Whisper self-check: fp32 {fp32_time:.2f}s, int8 {int8_time:.2f}s "
+              f"({fp32_time / max(int8_time, 1e-6):.1f}x), WER vs fp32 {wer:.1%}")
+        
+        if wer > Config.WHISPER_SELFCHECK_MAX_WER:
+            print(f"[WARN] int8 transcript differs too much from fp32, keeping fp32 model")
+            return False
+        return True
+
+    def enable_batching(self) -> bool:
+        """Route transcribe() through a micro-batching worker (see WhisperBatcher)."""
+        from .whisper_batcher import WhisperBatcher
+        if not self.batcher:
+            self.batcher = WhisperBatcher(self.model, self.device)
+        return True
+
+    def transcribe(self, samples: np.ndarray, prompt: str = None) -> str:
+        """Transcribe int16 PCM samples, optionally conditioned on preceding text."""
         try:
-            print("Transcribing with Whisper...")
+            if self.batcher:
+                return self.batcher.submit(samples, prompt).result()
             
-            # Transcribe using Whisper
+            # Transcribe straight from memory (no temp WAV / ffmpeg decode)
             result = self.model.transcribe(
-                temp_filename,
+                pcm_to_float(samples),
                 language="en",  # Force English
-                fp16=(self.device == "cuda")  # Use FP16 on GPU for speed
+                fp16=(self.device == "cuda"),  # Use FP16 on GPU for speed
+                initial_prompt=prompt
             )
             
             transcript = result["text"].strip()
@@ -133,12 +161,9 @@ class WhisperHandler:
         except Exception as e:
             print(f"Whisper Transcription Error: {e}")
             return ""
-        finally:
-            try:
-                os.remove(temp_filename)
-            except:
-                pass
 
     def close(self):
-        self.stop_listening()
-        self.audio.terminate()
+        super().close()
+        if self.batcher:
+            print(f"[OK] Whisper batching: {self.batcher.summary()}")
+            self.batcher.close()
@@ -0,0 +1,249 @@
+"""
+Offline latency benchmark for the Interview Agent.
+
+Runs interview turns end to end (VAD -> STT -> Bedrock -> Polly) on WAV
+fixtures instead of the microphone, with local stand-ins for the Bedrock and
+Polly clients, so results only depend on this machine. Each STT engine /
+model size runs in its own process so peak RSS is measured per configuration.
+
+    python benchmark.py --engines whisper,faster-whisper --model-sizes tiny,base \\
+        --fixtures recordings/ --output bench.json --thresholds benchmark_thresholds.json
+
+Exits with status 1 if any threshold is exceeded.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from agent_core.config import Config
+
+LOCAL_ENGINES = ("whisper", "faster-whisper")
+
+
+def synthetic_answer(seconds=4.0, rate=Config.SAMPLE_RATE, seed=0) -> np.ndarray:
+    """
+    Speech-like test signal: voiced harmonics with a syllable-rate envelope,
+    followed by room-noise silence long enough to end the turn.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 130 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    speech = 6000 * voiced * envelope
+    silence = np.zeros(int((Config.SILENCE_DURATION + 0.5) * rate))
+    audio = np.concatenate((speech, silence))
+    audio += rng.normal(0, 30, len(audio))
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def load_fixtures(directory: str = None):
+    """Answer clips from a directory of WAVs, or one synthetic clip."""
+    if not directory:
+        return {"synthetic": synthetic_answer()}
+    from agent_core.batch_runner import read_wav
+    return {
+        name: read_wav(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory)) if name.lower().endswith(".wav")
+    }
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def end_of_speech(samples: np.ndarray, chunk=1024):
+    """Run the VAD over a clip as if it were streamed; return (end sample, trailing silence)."""
+    from agent_core.vad import VoiceActivityDetector
+    vad = VoiceActivityDetector(Config.SAMPLE_RATE)
+    for end in range(chunk, len(samples) + chunk, chunk):
+        vad.process(samples[end - chunk:end])
+        if vad.has_speech and vad.trailing_silence >= Config.SILENCE_DURATION:
+            return min(end, len(samples)), vad.trailing_silence
+    return len(samples), vad.trailing_silence
+
+
+def run_config(engine: str, model_size: str, fixtures_dir: str, turns: int, fake: dict) -> dict:
+    """Benchmark one STT engine / model size (runs in a fresh process)."""
+    from agent_core.stt_engine import create_stt_engine
+    from agent_core.bedrock_handler import BedrockHandler
+    from agent_core.polly_handler import PollyHandler
+    from agent_core.metrics import MetricsRecorder
+    from agent_core.fake_aws import FakeBedrockClient, FakePollyClient
+
+    result = {"engine": engine, "model_size": model_size if engine in LOCAL_ENGINES else None}
+    fixtures = load_fixtures(fixtures_dir)
+    metrics = MetricsRecorder(f"bench_{engine}_{model_size}", metrics_dir=tempfile.mkdtemp())
+
+    start = time.perf_counter()
+    kwargs = {"model_size": model_size} if engine in LOCAL_ENGINES else {}
+    stt = create_stt_engine(engine, capture=False, **kwargs)
+    result["load_s"] = round(time.perf_counter() - start, 2)
+    stt.metrics = metrics
+
+    brain = BedrockHandler(client=FakeBedrockClient(fake["bedrock_ttft"], fake["bedrock_tokens_per_s"]))
+    brain.metrics = metrics
+    notes = "Incident response. Triage alerts, collect logs, contain the host, eradicate and recover."
+    brain.initialize_interview(notes)
+    polly = PollyHandler(playback=False)
+    polly.client = FakePollyClient(fake["polly_first_byte"])
+    polly.cache = None  # Measure synthesis, not cache hits
+    polly.metrics = metrics
+    brain.get_first_question()
+
+    audio_seconds = 0.0
+    run_start = time.perf_counter()
+    for turn in range(turns):
+        name, samples = list(fixtures.items())[turn % len(fixtures)]
+        metrics.next_turn()
+        end, trailing = end_of_speech(samples)
+        metrics.record("vad_endpoint", trailing)
+        audio_seconds += end / Config.SAMPLE_RATE
+
+        spoken_at = time.perf_counter()
+        with metrics.span("stt", fixture=name):
+            answer = stt.transcribe(samples[:end])
+        # Synthetic audio has no words; keep the conversation going regardless
+        answer = answer or "I would start by checking the authentication logs."
+
+        sentences = brain.stream_response(answer) if Config.STREAM_RESPONSES else [brain.get_response(answer)]
+        first_audio = None
+        for sentence in sentences:
+            for _ in polly.stream_audio(sentence):
+                if first_audio is None:
+                    first_audio = time.perf_counter() - spoken_at
+                    metrics.record("first_audio", first_audio)
+        metrics.record("turn", time.perf_counter() - spoken_at)
+
+    elapsed = time.perf_counter() - run_start
+    stt_total = sum(metrics.durations.get("stt", []))
+    stt.close()
+    metrics.close()
+
+    result.update({
+        "turns": turns,
+        "throughput_turns_per_s": round(turns / elapsed, 3),
+        "stt_realtime_factor": round(stt_total / max(audio_seconds, 1e-6), 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {name: {k: round(v, 1) for k, v in stats.items()} for name, stats in metrics.summary().items()},
+    })
+    return result
+
+
+def check_thresholds(results, thresholds: dict):
+    """
+    Compare results with thresholds. Keys are "<stage>.p50|p95|p99" (ms),
+    "peak_rss_mb" and "stt_realtime_factor" (maximums) or
+    "throughput_turns_per_s" (minimum). Per-configuration sections named
+    "engine:model_size" override "default".
+    """
+    failures = []
+    for result in results:
+        label = f"{result['engine']}:{result['model_size']}" if result["model_size"] else result["engine"]
+        limits = {**thresholds.get("default", {}), **thresholds.get(label, {})}
+        for key, limit in limits.items():
+            if "." in key:
+                stage, stat = key.split(".", 1)
+                value = result["stages"].get(stage, {}).get(stat)
+            else:
+                value = result.get(key)
+            if value is None:
+                continue
+            if key == "throughput_turns_per_s":
+                if value < limit:
+                    failures.append(f"{label}: {key} {value} < {limit}")
+            elif value > limit:
+                failures.append(f"{label}: {key} {value} > {limit}")
+    return failures
+
+
+def print_table(results):
+    print(f"\n{'config':<24}{'load s':>8}{'stt p95':>10}{'ttft p95':>10}{'1st audio p95':>15}"
+          f"{'turn p95':>10}{'turns/s':>9}{'RSS MB':>9}")
+    for r in results:
+        label = f"{r['engine']}:{r['model_size']}" if r["model_size"] else r["engine"]
+        stage = lambda name: r["stages"].get(name, {}).get("p95", float("nan"))
+        print(f"{label:<24}{r['load_s']:>8.1f}{stage('stt'):>10.0f}{stage('llm_ttft'):>10.0f}"
+              f"{stage('first_audio'):>15.0f}{stage('turn'):>10.0f}{r['throughput_turns_per_s']:>9.2f}"
+              f"{r['peak_rss_mb'] or float('nan'):>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Interview Agent latency benchmark")
+    parser.add_argument("--engines", default="whisper", help="comma-separated STT engines")
+    parser.add_argument("--model-sizes", default=Config.STT_MODEL_SIZE, help="comma-separated model sizes")
+    parser.add_argument("--fixtures", help="directory of answer WAVs (default: synthetic audio)")
+    parser.add_argument("--turns", type=int, default=10, help="turns per configuration")
+    parser.add_argument("--bedrock-ttft", type=float, default=0.35, help="fake Bedrock time to first token (s)")
+    parser.add_argument("--bedrock-tokens-per-s", type=float, default=60.0, help="fake Bedrock streaming rate")
+    parser.add_argument("--polly-first-byte", type=float, default=0.12, help="fake Polly time to first byte (s)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--thresholds", help="JSON file of regression thresholds")
+    args = parser.parse_args()
+
+    fake = {
+        "bedrock_ttft": args.bedrock_ttft,
+        "bedrock_tokens_per_s": args.bedrock_tokens_per_s,
+        "polly_first_byte": args.polly_first_byte,
+    }
+    configs = []
+    for engine in args.engines.split(","):
+        sizes = args.model_sizes.split(",") if engine in LOCAL_ENGINES else [None]
+        configs.extend((engine, size) for size in sizes)
+
+    results = []
+    errors = []
+    for engine, size in configs:
+        print(f"⏱️  Benchmarking {engine} {size or ''}...")
+        # A fresh process per configuration keeps model memory and peak RSS separate
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            try:
+                results.append(pool.submit(run_config, engine, size, args.fixtures, args.turns, fake).result())
+            except Exception as e:
+                print(f"[ERROR] {engine} {size or ''}: {e}")
+                errors.append({"engine": engine, "model_size": size, "error": str(e)})
+
+    print_table(results)
+    report = {"timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'), "fake_aws": fake, "results": results, "errors": errors}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Results saved to {args.output}")
+
+    failed = False
+    if args.thresholds:
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            failures = check_thresholds(results, json.load(f))
+        if failures:
+            print("\n❌ Regression thresholds exceeded:")
+            for failure in failures:
+                print(f"   {failure}")
+            failed = True
+        else:
+            print("\n✅ All regression thresholds met")
+
+    if errors:
+        # A configuration that could not run has no results to check, so it must fail the gate itself
+        print(f"\n❌ {len(errors)} configuration(s) failed to run:")
+        for error in errors:
+            print(f"   {error['engine']} {error['model_size'] or ''}: {error['error']}")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
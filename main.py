@@ -3,93 +3,146 @@ Hybrid Interview Agent - Main Application
 Real-time AI interviewer using Sarvam AI (STT), Gemini AI (Brain), and AWS Polly (TTS)
 """
 import time
+import asyncio
+import argparse
 from agent_core.config import Config
-from agent_core.whisper_handler import WhisperHandler
+from agent_core.stt_engine import create_stt_engine
 from agent_core.bedrock_handler import BedrockHandler
 from agent_core.polly_handler import PollyHandler
+from agent_core.startup import StartupOrchestrator
+from agent_core.pipeline import InterviewPipeline
+from agent_core.metrics import create_metrics
+from agent_core.session_journal import SessionJournal
 
-def main():
-    """Main interview loop."""
+def speak_streamed(polly, sentences):
+    """Print and speak interviewer sentences as they stream in from Bedrock."""
+    def echo(sentences):
+        print("🗣️  Interviewer: ", end="", flush=True)
+        for sentence in sentences:
+            print(sentence, end=" ", flush=True)
+            yield sentence
+        print()
+    
+    polly.speak_stream(echo(sentences))
+
+def main(resume=None):
+    """
+    Main interview loop.
+    Args:
+        resume: session id of an interrupted interview to continue from its journal
+    """
     print("=" * 60)
-    print("🤖 STUDY MATERIAL INTERVIEW AGENT (Whisper + Bedrock + Polly)")
+    print(f"🤖 STUDY MATERIAL INTERVIEW AGENT ({Config.STT_ENGINE} + Bedrock + Polly)")
     print("=" * 60)
     
+    journal = None
     try:
         # Validate configuration
         Config.validate()
         print("✅ Configuration validated")
         
-        # Load study notes
-        with open(Config.NOTES_PATH, 'r', encoding='utf-8') as f:
-            notes_text = f.read()
-        print(f"✅ Study notes loaded from {Config.NOTES_PATH}")
-        
-        # Initialize handlers
+        # Initialize handlers concurrently: the STT model loads while Bedrock
+        # generates the first question and Polly starts speaking it
         print("Initializing handlers...")
-        whisper = WhisperHandler(model_size="small")  # Use "small" for better accuracy
-        brain = BedrockHandler()
-        polly = PollyHandler()
-        
-        # Initialize interview session with notes
-        brain.initialize_interview(notes_text)
+        startup = StartupOrchestrator()
+        records = SessionJournal.load(resume) if resume else None
+        journal = SessionJournal(resume)
+        metrics = create_metrics(journal.session_id)  # No-op unless METRICS_ENABLED
+        print(f"✅ Session {journal.session_id} ({'resumed' if resume else 'journal'}: {journal.path})")
+        
+        def load_notes():
+            with open(Config.NOTES_PATH, 'r', encoding='utf-8') as f:
+                notes_text = f.read()
+            print(f"✅ Study notes loaded from {Config.NOTES_PATH}")
+            return notes_text
+        
+        def init_brain():
+            brain = BedrockHandler()
+            brain.metrics = metrics
+            # Initialize interview session with notes
+            brain.initialize_interview(notes_future.result())
+            if records:
+                brain.pending_answer = brain.restore(records)
+            brain.journal = journal
+            return brain
+        
+        def init_polly():
+            polly = PollyHandler()
+            polly.metrics = metrics
+            return polly
+        
+        def ask_first_question():
+            brain = brain_future.result()
+            polly = polly_future.result()
+            history = brain.conversation_history
+            if records and history:
+                if brain.pending_answer:
+                    # Crashed after the answer was recorded: reply to it now
+                    print("\n🤖 Interviewer is thinking...")
+                    speak_streamed(polly, brain.stream_pending_response())
+                    return
+                if history[-1]['role'] == "assistant":
+                    # Repeat the question that was waiting for an answer (usually a TTS cache hit)
+                    last_question = history[-1]['content'][0]['text']
+                    print(f"🗣️  Interviewer: {last_question}")
+                    polly.speak(last_question)
+                    return
+            # New session, or the journal ended before the first question was asked
+            print("\n🤖 Interviewer is thinking...")
+            if Config.STREAM_RESPONSES:
+                speak_streamed(polly, brain.stream_first_question())
+            else:
+                first_question = brain.get_first_question()
+                print(f"🗣️  Interviewer: {first_question}")
+                
+                if first_question:
+                    print("🔊 Speaking question...")
+                    polly.speak(first_question)
         
-        # Start listening (Whisper needs to open stream)
-        whisper.start_listening()
+        notes_future = startup.submit("notes", load_notes)
+        stt_future = startup.submit("stt", create_stt_engine)  # Engine and model size come from Config
+        brain_future = startup.submit("bedrock", init_brain)
+        polly_future = startup.submit("polly", init_polly)
+        first_question_future = startup.submit("first question", ask_first_question)
         
-        # Get first question
         print("\n" + "=" * 60)
         print("🎬 STARTING INTERVIEW")
         print("=" * 60)
         
-        print("\n🤖 Interviewer is thinking...")
-        first_question = brain.get_first_question()
-        print(f"🗣️  Interviewer: {first_question}")
-        
-        if first_question:
-            print("🔊 Speaking question...")
-            polly.speak(first_question)
-        
-        # Main interview loop
-        question_count = 1
-        
-        while question_count < Config.MAX_QUESTIONS:
-            print(f"\n--- Question {question_count + 1} ---")
-            
-            # Listen to user's answer
-            print("🎤 Listening... (Speak now)")
-            user_answer = whisper.listen_once()
-            
-            if not user_answer:
-                print("⚠️  No speech detected. Please try again.")
-                continue
-                
-            print(f"📝 You said: {user_answer}")
-            
-            # Check for exit commands
-            if any(cmd in user_answer.lower() for cmd in ["end interview", "stop interview", "exit"]):
-                print("\n👋 Interview ended by user")
-                break
-            
-            # Get AI response
-            print("\n🤖 Interviewer is thinking...")
-            response_text = brain.get_response(user_answer)
-            print(f"🗣️  Interviewer: {response_text}")
-            
-            if response_text:
-                print("🔊 Speaking response...")
-                polly.speak(response_text)
-            
-            question_count += 1
+        stt = stt_future.result()
+        stt.metrics = metrics
+        brain = brain_future.result()
+        polly = polly_future.result()
+        
+        # Start listening (STT engine needs to open stream)
+        stt.start_listening()
+        first_question_future.result()
+        startup.report()
+        startup.shutdown()
+        
+        # Main interview loop: overlapped STT/LLM/TTS/playback stages on one event loop
+        question_count = sum(1 for entry in brain.conversation_history if entry['role'] == 'assistant')
+        asyncio.run(InterviewPipeline(stt, brain, polly).run(question_count=question_count))
         
         # Cleanup
-        whisper.close()
+        stt.close()
+        polly.close()
         
         # Generate report
         print("\n" + "=" * 60)
         print("📊 INTERVIEW COMPLETE")
         print("=" * 60)
         
-        report_path = brain.generate_report()
+        report_path = brain.generate_report(session_id=journal.session_id if resume else None)
+        metrics.close()
+        journal.close(finished=True)
+        
+        if polly.cache:
+            print(f"🔊 TTS cache: {polly.cache.summary()}")
+        print(f"🧠 Bedrock: {brain.client.summary()}")
+        print(f"🧭 Model routing: {brain.router.summary()}")
+        if Config.SPECULATIVE_REPLIES:
+            print(f"⚡ Speculative replies: {brain.speculation_summary()}")
         
         print("\n" + "=" * 60)
         print("✅ Interview session completed successfully!")
@@ -105,8 +158,11 @@ def main():
         
     except KeyboardInterrupt:
         print("\n\n👋 Interview interrupted by user")
+        if journal:
+            journal.close()
+            print(f"   Continue later with: python main.py --resume {journal.session_id}")
         try:
-            whisper.close()
+            stt.close()
         except:
             pass
         
@@ -114,13 +170,61 @@ def main():
         print(f"\n❌ Unexpected error: {e}")
         import traceback
         traceback.print_exc()
+        if journal:
+            journal.close()
+            print(f"   Continue later with: python main.py --resume {journal.session_id}")
         try:
-            whisper.close()
+            stt.close()
         except:
             pass
 
+def run_server(host, port):
+    """Serve interview sessions over WebSocket instead of the local microphone."""
+    from agent_core.interview_server import InterviewServer
+    
+    server = InterviewServer(host=host, port=port)
+    try:
+        Config.validate()
+        server.load()
+        asyncio.run(server.serve_forever())
+    except ValueError as e:
+        print(f"\n❌ Configuration Error: {e}")
+    except KeyboardInterrupt:
+        print("\n\n👋 Server stopped")
+    finally:
+        server.shutdown()
+
+def run_batch(directory, workers):
+    """Transcribe and score recorded interviews without a microphone."""
+    from agent_core.batch_runner import BatchRunner
+    
+    try:
+        Config.validate()
+        BatchRunner(directory, workers=workers).run()
+    except ValueError as e:
+        print(f"\n❌ Configuration Error: {e}")
+    except KeyboardInterrupt:
+        print("\n\n👋 Batch interrupted, rerun the same command to resume")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Study material interview agent")
+    parser.add_argument("--server", action="store_true", help="run the multi-session WebSocket server")
+    parser.add_argument("--host", default=Config.SERVER_HOST, help="server bind address")
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT, help="server port")
+    parser.add_argument("--resume", metavar="SESSION", help="continue an interrupted interview from its journal")
+    parser.add_argument("--batch", metavar="DIR", help="score recorded interviews in DIR instead of running live")
+    parser.add_argument("--workers", type=int, default=Config.BATCH_WORKERS,
+                        help="worker processes for --batch (0 = one per CPU core)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     print("\n🚀 Starting Interview Agent...")
     print("Press Ctrl+C to exit at any time\n")
     
-    main()
+    if args.batch:
+        run_batch(args.batch, args.workers)
+    elif args.server:
+        run_server(args.host, args.port)
+    else:
+        main(resume=args.resume)